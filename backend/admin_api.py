@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Body
+from fastapi import APIRouter, Depends, HTTPException, Query, Body, BackgroundTasks
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any, Optional
 from datetime import datetime
@@ -49,19 +49,33 @@ async def get_users(
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
     search: Optional[str] = Query(None),
+    after_created_at: Optional[datetime] = Query(None),
+    after_id: Optional[int] = Query(None),
     admin_user: dict = Depends(require_admin),
     db: Session = Depends(get_db)
 ):
-    """Get paginated list of users with optional search"""
+    """Get paginated list of users with optional search.
+    
+    Pass the returned next_cursor values as after_created_at/after_id to fetch
+    the next page without an OFFSET scan.
+    """
     try:
-        users = admin_service.get_users(db, limit=limit, offset=offset, search=search)
+        users = admin_service.get_users(
+            db, limit=limit, offset=offset, search=search,
+            after_created_at=after_created_at, after_id=after_id
+        )
         total_count = db.query(User).count()
         
+        next_cursor = None
+        if len(users) == limit:
+            next_cursor = {"after_created_at": users[-1]["created_at"], "after_id": users[-1]["id"]}
+        
         return {
             "users": users,
             "total_count": total_count,
             "limit": limit,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": next_cursor
         }
     
     except Exception as e:
@@ -254,6 +268,7 @@ async def get_system_config(
 # Data Management
 @admin_router.post("/data/export")
 async def create_data_export(
+    background_tasks: BackgroundTasks,
     export_type: str = Body(...),
     filters: Dict[str, Any] = Body({}),
     admin_user: dict = Depends(require_admin),
@@ -267,6 +282,7 @@ async def create_data_export(
         result = admin_service.create_data_export(
             db, export_type, filters, admin_user["email"]
         )
+        background_tasks.add_task(admin_service.process_data_export, result["export_id"])
         return result
     
     except HTTPException:
@@ -14,6 +14,8 @@ class Config:
     
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./trading_app.db")
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))  # Pooled connections kept open (non-SQLite databases)
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))  # Extra connections allowed under load
     
     # API Keys
     NEWS_API_KEY: str = os.getenv("NEWS_API_KEY", "demo")
@@ -31,11 +33,14 @@ class Config:
     # Rate Limiting
     API_RATE_LIMIT: float = float(os.getenv("API_RATE_LIMIT", "3.0"))  # seconds between API calls (increased for reliability)
     NEWS_API_RATE_LIMIT: float = float(os.getenv("NEWS_API_RATE_LIMIT", "2.0"))  # Increased to prevent rate limiting
+    YF_MAX_CONCURRENCY: int = int(os.getenv("YF_MAX_CONCURRENCY", "8"))  # Yahoo Finance requests in flight at once
+    YF_REQUESTS_PER_SECOND: float = float(os.getenv("YF_REQUESTS_PER_SECOND", "5"))  # Sustained Yahoo Finance request rate (0 disables)
     
     # Continuous Monitoring
     SENTIMENT_REFRESH_INTERVAL_MINUTES: int = int(os.getenv("SENTIMENT_REFRESH_INTERVAL_MINUTES", "30"))
     PRICE_CHECK_INTERVAL_MINUTES: int = int(os.getenv("PRICE_CHECK_INTERVAL_MINUTES", "5"))
     ALERT_COOLDOWN_MINUTES: int = int(os.getenv("ALERT_COOLDOWN_MINUTES", "60"))
+    MONITOR_CONCURRENCY: int = int(os.getenv("MONITOR_CONCURRENCY", "8"))  # Concurrent market data fetches per cycle
     
     # Logging
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
@@ -1,7 +1,9 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
+from fastapi import HTTPException
+from fastapi.exceptions import RequestValidationError
 import os
 import logging
 
@@ -10,19 +12,37 @@ from exceptions import DatabaseError
 
 logger = logging.getLogger(__name__)
 
+IS_SQLITE = config.DATABASE_URL.startswith("sqlite")
+
 # Create engine with improved configuration
 engine = create_engine(
     config.DATABASE_URL,
     connect_args={
         "check_same_thread": False,
         "timeout": 30
-    } if config.DATABASE_URL.startswith("sqlite") else {},
-    poolclass=StaticPool if config.DATABASE_URL.startswith("sqlite") else None,
+    } if IS_SQLITE else {},
+    poolclass=StaticPool if IS_SQLITE else None,
+    # Server databases keep a pool of open connections instead of reconnecting per request
+    **({} if IS_SQLITE else {
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW
+    }),
     echo=False,  # Set to True for SQL debugging
     pool_pre_ping=True,
     pool_recycle=3600
 )
 
+if IS_SQLITE:
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Tune each new SQLite connection: WAL journal, fewer fsyncs, larger page cache."""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")  # Ignored for in-memory databases
+        cursor.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL; syncs at checkpoints only
+        cursor.execute("PRAGMA cache_size=-64000")  # ~64 MB page cache
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
 logger.info(f"Database engine created for: {config.DATABASE_URL}")
 
 # Create SessionLocal class
@@ -36,6 +56,10 @@ def get_db():
     db = SessionLocal()
     try:
         yield db
+    except (HTTPException, RequestValidationError):
+        # Request errors keep their 4xx status instead of becoming database errors
+        db.rollback()
+        raise
     except Exception as e:
         logger.error(f"Database session error: {str(e)}")
         db.rollback()
@@ -1,5 +1,6 @@
-from fastapi import FastAPI, HTTPException, Depends, Body, Request
+from fastapi import FastAPI, HTTPException, Depends, Body, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from sqlalchemy.orm import Session
 import uvicorn
@@ -13,12 +14,14 @@ from typing import Dict, Any, List, Optional
 from database import get_db, engine, Base
 from models import Trade, SentimentData, StockData, TradeRecommendation, Strategy, Position
 from schemas import (
-    TradeCreate, TradeResponse, SentimentResponse,
+    TradeCreate, TradeResponse, SentimentResponse, SentimentResponseList,
     SentimentAnalysisRequest, BulkSentimentResponse,
+    QuantizedSentimentResponse, QuantizedBulkSentimentResponse,
     TradeRecommendationResponse, MarketScanResult,
     GoogleLoginRequest, AuthResponse,
-    StrategyCreate, StrategyResponse, StrategyRunRequest,
-    PositionResponse, PositionSummaryResponse, ExitConditionRequest
+    StrategyCreate, StrategyResponse, StrategyResponseList, StrategyRunRequest,
+    PositionResponse, PositionSummaryResponse, ExitConditionRequest,
+    StrategySignal, TradeApprovalRequest
 )
 from services.trading_service import TradingService
 from services.sentiment_service import SentimentService
@@ -38,10 +41,12 @@ from performance_fixes import (
     get_optimized_performance_metrics,
     get_optimized_portfolio_history,
     get_paginated_trades,
-    get_all_trades_compatible,
+    get_all_trades_compatible_json,
     get_optimized_capital_status,
     get_optimized_risk_assessment,
-    clear_performance_caches
+    get_dashboard_bundle,
+    clear_performance_caches,
+    invalidate_trades_cache
 )
 
 # Setup logging
@@ -58,7 +63,8 @@ except Exception as e:
 app = FastAPI(
     title="Trading Sentiment Analysis", 
     version="1.0.0",
-    description="Sentiment-based paper trading system"
+    description="Sentiment-based paper trading system",
+    default_response_class=ORJSONResponse
 )
 
 # Include admin routes
@@ -211,7 +217,7 @@ async def get_current_user_info(current_user: dict = Depends(get_current_user)):
     return {"user": current_user}
 
 @app.get("/api/trades")
-async def get_trades(page: Optional[int] = None, limit: Optional[int] = None, db: Session = Depends(get_db)):
+async def get_trades(request: Request, page: Optional[int] = None, limit: Optional[int] = None, db: Session = Depends(get_db)):
     """Get paper trades - supports both paginated and legacy formats"""
     try:
         # If pagination parameters are provided, return paginated format
@@ -222,7 +228,15 @@ async def get_trades(page: Optional[int] = None, limit: Optional[int] = None, db
         
         # Otherwise, return frontend-compatible format (direct array)
         # Limited to recent 200 trades to avoid timeout but maintain compatibility
-        return get_all_trades_compatible(db)
+        # Served from pre-serialized (and pre-gzipped) bytes to skip per-request encoding
+        data, compressed = get_all_trades_compatible_json(db)
+        if "gzip" in request.headers.get("accept-encoding", ""):
+            return Response(
+                content=compressed,
+                media_type="application/json",
+                headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"}
+            )
+        return Response(content=data, media_type="application/json", headers={"Vary": "Accept-Encoding"})
     except Exception as e:
         logger.error(f"Error getting trades: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
@@ -620,7 +634,8 @@ async def get_sentiment(symbol: str, db: Session = Depends(get_db)):
 @app.get("/api/sentiment")
 async def get_all_sentiment(db: Session = Depends(get_db)):
     """Get sentiment for all tracked stocks"""
-    return sentiment_service.get_all_sentiment(db)
+    sentiments = sentiment_service.get_all_sentiment(db)
+    return Response(content=SentimentResponseList.dump_json(sentiments), media_type="application/json")
 
 @app.post("/api/analyze-sentiment")
 async def analyze_sentiment(symbol: str = Body(..., embed=True), db: Session = Depends(get_db)):
@@ -647,6 +662,15 @@ async def get_performance(db: Session = Depends(get_db)):
         logger.error(f"Error getting performance metrics: {str(e)}")
         raise HTTPException(status_code=500, detail="Performance calculation error")
 
+@app.get("/api/dashboard")
+async def get_dashboard(db: Session = Depends(get_db)):
+    """Get balance, performance metrics and capital status in a single round-trip"""
+    try:
+        return get_dashboard_bundle(db, trading_service)
+    except Exception as e:
+        logger.error(f"Error getting dashboard bundle: {str(e)}")
+        raise HTTPException(status_code=500, detail="Dashboard calculation error")
+
 @app.get("/api/portfolio-history")
 async def get_portfolio_history(days: int = 30, db: Session = Depends(get_db)):
     """Get portfolio value history for charting (optimized for performance)"""
@@ -1243,6 +1267,7 @@ async def simple_database_fix(db: Session = Depends(get_db)):
             results["actions_taken"].append("Created 5 fresh trades for today")
         
         db.commit()
+        invalidate_trades_cache()
         
         # Verify results
         watchlist_count = db.query(WatchlistStock).filter(WatchlistStock.is_active == True).count()
@@ -2228,7 +2253,13 @@ async def analyze_bulk_sentiment(request: SentimentAnalysisRequest, db: Session
                 errors.append(error_msg)
                 logger.error(error_msg)
         
-        response = BulkSentimentResponse(
+        if request.quantized:
+            response_class = QuantizedBulkSentimentResponse
+            results = [QuantizedSentimentResponse.model_validate(r) for r in results]
+        else:
+            response_class = BulkSentimentResponse
+        
+        response = response_class(
             results=results,
             errors=errors,
             total_processed=len(request.symbols),
@@ -2431,7 +2462,8 @@ async def get_strategies(active_only: bool = True, db: Session = Depends(get_db)
     """Get all trading strategies."""
     try:
         strategies = strategy_service.get_strategies(db, active_only)
-        return strategies
+        # Already validated by the service; serialize directly instead of re-validating
+        return Response(content=StrategyResponseList.dump_json(strategies), media_type="application/json")
     except Exception as e:
         logger.error(f"Error getting strategies: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -2524,7 +2556,8 @@ async def get_positions(strategy_id: Optional[int] = None, db: Session = Depends
         summary = position_manager.get_position_summary(db, strategy_id)
         if 'error' in summary:
             raise HTTPException(status_code=400, detail=summary['error'])
-        return summary
+        # Validate once and serialize directly instead of going through response_model again
+        return Response(content=PositionSummaryResponse(**summary).model_dump_json(), media_type="application/json")
     except HTTPException:
         raise
     except Exception as e:
@@ -2893,16 +2926,14 @@ async def get_pending_signals():
         raise HTTPException(status_code=500, detail="Pending signals error")
 
 @app.post("/api/trading/signals/preview")
-async def preview_trade_signal(signal: dict, db: Session = Depends(get_db)):
+async def preview_trade_signal(signal: StrategySignal, db: Session = Depends(get_db)):
     """Preview a trade signal before execution."""
     try:
         from services.trading_control_service import TradingControlService
-        from schemas import StrategySignal
         
-        # Convert dict to StrategySignal
-        signal_obj = StrategySignal(**signal)
+        # FastAPI validates the body into StrategySignal (invalid bodies get a 422)
         control_service = TradingControlService()
-        preview = control_service.preview_trade_signal(db, signal_obj)
+        preview = control_service.preview_trade_signal(db, signal)
         return preview
         
     except Exception as e:
@@ -2910,16 +2941,14 @@ async def preview_trade_signal(signal: dict, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail="Trade signal preview error")
 
 @app.post("/api/trading/signals/approve")
-async def approve_trade_signal(approval: dict):
+async def approve_trade_signal(approval: TradeApprovalRequest):
     """Approve or reject a pending trade signal."""
     try:
         from services.trading_control_service import TradingControlService
-        from schemas import TradeApprovalRequest
         
-        # Convert dict to TradeApprovalRequest
-        approval_obj = TradeApprovalRequest(**approval)
+        # FastAPI validates the body into TradeApprovalRequest (invalid bodies get a 422)
         control_service = TradingControlService()
-        result = control_service.approve_trade_signal(approval_obj)
+        result = control_service.approve_trade_signal(approval)
         return result
         
     except Exception as e:
@@ -3015,7 +3044,7 @@ async def get_trade_patterns(
     """Get discovered trade patterns with optional filtering"""
     try:
         from models import TradePattern
-        from schemas import TradePatternResponse
+        from schemas import TradePatternResponseList
         
         query = db.query(TradePattern)
         
@@ -3032,7 +3061,7 @@ async def get_trade_patterns(
         total_patterns_in_db = db.query(TradePattern).count()
         logger.info(f"Patterns endpoint: Found {len(patterns)} patterns (filtered), {total_patterns_in_db} total in DB")
         
-        return [TradePatternResponse.from_orm(pattern) for pattern in patterns]
+        return TradePatternResponseList.validate_python(patterns)
         
     except Exception as e:
         logger.error(f"Error getting trade patterns: {str(e)}")
@@ -3047,7 +3076,7 @@ async def get_strategy_adjustments(
     """Get strategy parameter adjustments made by the learning system"""
     try:
         from models import StrategyLearning
-        from schemas import StrategyLearningResponse
+        from schemas import StrategyLearningResponseList
         
         cutoff_date = datetime.now() - timedelta(days=days_back)
         
@@ -3060,7 +3089,7 @@ async def get_strategy_adjustments(
         
         adjustments = query.order_by(desc(StrategyLearning.adjustment_date)).all()
         
-        return [StrategyLearningResponse.from_orm(adj) for adj in adjustments]
+        return StrategyLearningResponseList.validate_python(adjustments)
         
     except Exception as e:
         logger.error(f"Error getting strategy adjustments: {str(e)}")
@@ -3077,7 +3106,7 @@ async def get_learning_insights(
     """Get insights discovered by the learning system"""
     try:
         from models import LearningInsight
-        from schemas import LearningInsightResponse
+        from schemas import LearningInsightResponseList
         
         query = db.query(LearningInsight)
         
@@ -3090,7 +3119,7 @@ async def get_learning_insights(
         
         insights = query.order_by(desc(LearningInsight.confidence_score)).limit(limit).all()
         
-        return [LearningInsightResponse.from_orm(insight) for insight in insights]
+        return LearningInsightResponseList.validate_python(insights)
         
     except Exception as e:
         logger.error(f"Error getting learning insights: {str(e)}")
@@ -425,6 +425,9 @@ class WatchlistStock(Base):
     successful_trades = Column(Integer, default=0)
     total_pnl = Column(Float, default=0.0)
     
+    # Relationships
+    alerts = relationship("WatchlistAlert", back_populates="watchlist_stock")
+    
 class WatchlistAlert(Base):
     """Alerts and notifications for watchlist stocks"""
     __tablename__ = "watchlist_alerts"
@@ -458,4 +461,4 @@ class WatchlistAlert(Base):
     dismissed_at = Column(DateTime(timezone=True), nullable=True)
     
     # Relationships
-    watchlist_stock = relationship("WatchlistStock")
\ No newline at end of file
+    watchlist_stock = relationship("WatchlistStock", back_populates="alerts")
\ No newline at end of file
@@ -56,12 +56,36 @@ def create_database_indexes():
                 "columns": ["trade_type", "status"],
                 "reason": "Filter by BUY/SELL type and status (capital allocation calculations)"
             },
+            {
+                "name": "idx_trades_status_type_val",
+                "table": "trades",
+                "columns": ["status", "trade_type", "total_value", "profit_loss"],
+                "reason": "Covering index so balance/capital SUM(total_value)/SUM(profit_loss) aggregates are index-only scans (SQLite has no INCLUDE, so values are trailing key columns)"
+            },
+            {
+                "name": "idx_trades_timestamp_id",
+                "table": "trades",
+                "columns": ["timestamp DESC", "id DESC"],
+                "reason": "Stable ordering for recent trades and keyset pagination"
+            },
+            {
+                "name": "idx_trades_status_close_timestamp",
+                "table": "trades",
+                "columns": ["status", "close_timestamp"],
+                "reason": "Ordered scan of closed trades for drawdown/Sharpe window functions"
+            },
             {
                 "name": "idx_trades_symbol_status",
                 "table": "trades",
                 "columns": ["symbol", "status"],
                 "reason": "Position aggregation by symbol and status"
             },
+            {
+                "name": "idx_trades_status_profit_loss",
+                "table": "trades",
+                "columns": ["status", "profit_loss"],
+                "reason": "Closed trades with realized P&L for learning baselines and win/loss aggregates"
+            },
             
             # SENTIMENT_DATA table - used in sentiment analysis
             {
@@ -179,6 +203,14 @@ def create_database_indexes():
                 "reason": "Critical unread alerts"
             },
             
+            # USERS table - admin console
+            {
+                "name": "idx_users_created_at_id",
+                "table": "users",
+                "columns": ["created_at DESC", "id DESC"],
+                "reason": "Keyset pagination of the admin user list"
+            },
+            
             # USER_ACTIVITY table - analytics queries
             {
                 "name": "idx_user_activity_user_timestamp",
@@ -192,6 +224,12 @@ def create_database_indexes():
                 "columns": ["action", "timestamp DESC"],
                 "reason": "Activity analytics by action type"
             },
+            {
+                "name": "idx_user_activity_timestamp_action",
+                "table": "user_activity",
+                "columns": ["timestamp", "action"],
+                "reason": "Recent activity windows across all actions (admin metrics)"
+            },
             
             # TRADE_PATTERNS table - learning queries
             {
@@ -206,7 +244,39 @@ def create_database_indexes():
                 "columns": ["pattern_type", "pattern_strength DESC"],
                 "reason": "Strong patterns by type for learning"
             },
+            {
+                "name": "idx_trade_patterns_lookup",
+                "table": "trade_patterns",
+                "columns": ["symbol", "pattern_type", "price_trend", "volatility_level", "sentiment_score"],
+                "reason": "Existing-pattern lookup when merging extracted trade patterns"
+            },
+            {
+                "name": "idx_trade_patterns_type_occurrence",
+                "table": "trade_patterns",
+                "columns": ["pattern_type", "occurrence_count", "success_rate"],
+                "reason": "Successful-pattern scan for market insight generation"
+            },
+            {
+                "name": "idx_trade_patterns_created_at",
+                "table": "trade_patterns",
+                "columns": ["created_at"],
+                "reason": "Recently discovered patterns for the learning dashboard"
+            },
             
+            # LEARNING tables - recent insights and parameter adjustments
+            {
+                "name": "idx_learning_insights_discovered_at",
+                "table": "learning_insights",
+                "columns": ["discovered_at"],
+                "reason": "Recent insights for learning recommendations"
+            },
+            {
+                "name": "idx_strategy_learning_adjustment_date",
+                "table": "strategy_learning",
+                "columns": ["adjustment_date"],
+                "reason": "Recent parameter adjustments for learning recommendations"
+            },
+
             # SYSTEM_METRICS table - monitoring queries
             {
                 "name": "idx_system_metrics_name_timestamp",
@@ -337,6 +407,11 @@ def analyze_query_performance():
                 "sql": "SELECT SUM(total_value) FROM trades WHERE trade_type = 'BUY' AND status = 'OPEN'",
                 "explanation": "Used for available capital calculations"
             },
+            {
+                "name": "Closed trades profit/loss",
+                "sql": "SELECT SUM(total_value + COALESCE(profit_loss, 0)) FROM trades WHERE status = 'CLOSED'",
+                "explanation": "Used for balance calculations (should be a covering index scan)"
+            },
             {
                 "name": "Active strategies",
                 "sql": "SELECT COUNT(*) FROM strategies WHERE is_active = 1",
@@ -2,17 +2,38 @@
 Performance optimization fixes for production 502/504 timeouts.
 These optimized methods replace the slow database operations.
 """
+import gzip
 import logging
+from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy import func, desc, case
+import math
 import time
+import orjson
+
+from models import Trade
+
+# Resolve the strategy accessor once instead of getattr() with a default on every row
+_HAS_STRATEGY = hasattr(Trade, "strategy")
+_TRADE_LIST_COLUMNS = (
+    Trade.id, Trade.symbol, Trade.trade_type, Trade.quantity, Trade.price,
+    Trade.total_value, Trade.status, Trade.timestamp, Trade.profit_loss
+) + ((Trade.strategy,) if _HAS_STRATEGY else ())
+_get_strategy = (lambda t: t.strategy) if _HAS_STRATEGY else (lambda t: "MANUAL")
+
+# Static sector lookup for capital allocation (symbols not listed fall into "Other")
+TECH_SYMBOLS = frozenset({"AAPL", "GOOGL", "MSFT", "META", "NVDA", "AMD", "INTC"})
+SYMBOL_TO_SECTOR: Dict[str, str] = {symbol: "Technology" for symbol in TECH_SYMBOLS}
+SECTORS = ("Technology", "Other")
 
 # Cache for expensive operations
 _balance_cache = {"value": None, "timestamp": None}
 _performance_cache = {"value": None, "timestamp": None}
+_trades_json_cache = {"bytes": None, "gzip": None, "timestamp": None}
 CACHE_TIMEOUT = 300  # 5 minutes
+TRADES_CACHE_TIMEOUT = 30  # Trade list changes often; keep it short
 
 logger = logging.getLogger(__name__)
 
@@ -28,8 +49,6 @@ def get_cached_balance(db: Session, trading_service) -> float:
     
     # Recalculate and cache
     try:
-        from models import Trade
-        
         # Optimized balance calculation using aggregates
         open_buys_total = db.query(func.sum(Trade.total_value)).filter(
             Trade.status == "OPEN", Trade.trade_type == "BUY"
@@ -68,8 +87,6 @@ def get_optimized_performance_metrics(db: Session, trading_service) -> Dict:
         return _performance_cache["value"]
     
     try:
-        from models import Trade
-        
         # Use optimized balance calculation
         current_balance = get_cached_balance(db, trading_service)
         trading_service.current_balance = current_balance
@@ -108,9 +125,7 @@ def get_optimized_performance_metrics(db: Session, trading_service) -> Dict:
             average_profit = float(closed_trades_stats.avg_profit or 0)
             average_loss = float(closed_trades_stats.avg_loss or 0)
             
-            # Simplified max drawdown calculation (avoid loading all trades)
-            max_drawdown = 10.0  # Conservative estimate for display
-            sharpe_ratio = 0.5 if total_profit_loss > 0 else 0  # Simplified
+            max_drawdown, sharpe_ratio = _get_drawdown_and_sharpe(db, trading_service.initial_balance)
             
             total_return = (total_profit_loss / trading_service.initial_balance) * 100
             
@@ -139,6 +154,49 @@ def get_optimized_performance_metrics(db: Session, trading_service) -> Dict:
         # Fallback to original method but don't cache
         return trading_service.get_performance_metrics(db)
 
+def _get_drawdown_and_sharpe(db: Session, initial_balance: float) -> Tuple[float, float]:
+    """Max drawdown (%) and annualized Sharpe of closed trades via window functions (no row load)"""
+    # Running P&L in close order, then the running peak of that series
+    ordering = (Trade.close_timestamp, Trade.id)
+    running = db.query(
+        func.coalesce(Trade.profit_loss, 0).label('pl'),
+        func.sum(func.coalesce(Trade.profit_loss, 0)).over(order_by=ordering).label('cum'),
+        Trade.close_timestamp.label('close_timestamp'),
+        Trade.id.label('id')
+    ).filter(Trade.status == "CLOSED").subquery()
+
+    peaks = db.query(
+        running.c.pl,
+        running.c.cum,
+        func.max(running.c.cum).over(
+            order_by=(running.c.close_timestamp, running.c.id), rows=(None, 0)
+        ).label('peak')
+    ).subquery()
+
+    # Peak never drops below the starting balance (cumulative P&L of 0); drawdown is
+    # measured against peak equity (starting balance + peak P&L), not the starting balance
+    peak = case((peaks.c.peak > 0, peaks.c.peak), else_=0)
+    stats = db.query(
+        func.max((peak - peaks.c.cum) / func.nullif(initial_balance + peak, 0)).label('max_dd'),
+        func.count().label('n'),
+        func.avg(peaks.c.pl).label('mean_pl'),
+        func.avg(peaks.c.pl * peaks.c.pl).label('mean_sq_pl')
+    ).first()
+
+    if not stats or not stats.n:
+        return 0.0, 0.0
+
+    max_drawdown = float(stats.max_dd or 0) * 100
+
+    # Sample stddev from the aggregates (SQLite has no stddev_samp)
+    n = stats.n
+    mean_pl = float(stats.mean_pl or 0)
+    variance = (float(stats.mean_sq_pl or 0) - mean_pl * mean_pl) * n / (n - 1) if n > 1 else 0.0
+    volatility = math.sqrt(variance) if variance > 0 else 0.0
+    sharpe_ratio = mean_pl / volatility * math.sqrt(252) if volatility > 0 else 0.0
+
+    return max_drawdown, sharpe_ratio
+
 def get_optimized_portfolio_history(db: Session, trading_service, days: int = 30) -> List[Dict]:
     """Optimized portfolio history calculation avoiding expensive real-time calculations"""
     try:
@@ -172,30 +230,32 @@ def get_optimized_portfolio_history(db: Session, trading_service, days: int = 30
         logger.error(f"Error in optimized portfolio history: {str(e)}")
         return []
 
+def _trade_list_item(t) -> Dict:
+    """Frontend trade dict from a row selected with _TRADE_LIST_COLUMNS"""
+    return {
+        "id": t.id,
+        "symbol": t.symbol,
+        "trade_type": t.trade_type,
+        "quantity": t.quantity,
+        "price": t.price,
+        "total_value": t.total_value,
+        "status": t.status,
+        "timestamp": t.timestamp,  # ISO-8601 formatted natively by orjson
+        "profit_loss": t.profit_loss,
+        "strategy": _get_strategy(t)
+    }
+
 def get_paginated_trades(db: Session, page: int = 1, limit: int = 50) -> Dict:
     """Get trades with pagination to avoid loading all trades at once"""
     try:
-        from models import Trade
-        
         offset = (page - 1) * limit
         
-        trades = db.query(Trade).order_by(desc(Trade.timestamp)).offset(offset).limit(limit).all()
+        trades = db.query(*_TRADE_LIST_COLUMNS).order_by(desc(Trade.timestamp)).offset(offset).limit(limit).all()
         total_count = db.query(func.count(Trade.id)).scalar()
         
         return {
             "trades": [
-                {
-                    "id": t.id,
-                    "symbol": t.symbol,
-                    "trade_type": t.trade_type,
-                    "quantity": t.quantity,
-                    "price": t.price,
-                    "total_value": t.total_value,
-                    "status": t.status,
-                    "timestamp": t.timestamp.isoformat() if t.timestamp else None,
-                    "profit_loss": t.profit_loss,
-                    "strategy": getattr(t, 'strategy', 'MANUAL')  # Add missing strategy field
-                } for t in trades
+                _trade_list_item(t) for t in trades
             ],
             "pagination": {
                 "page": page,
@@ -209,39 +269,64 @@ def get_paginated_trades(db: Session, page: int = 1, limit: int = 50) -> Dict:
         logger.error(f"Error getting paginated trades: {str(e)}")
         return {"trades": [], "pagination": {"page": 1, "limit": limit, "total": 0, "pages": 0}}
 
+def _fetch_recent_trades(db: Session) -> List[Dict]:
+    """Recent 200 trades in frontend-compatible format (raises on database errors)"""
+    # For compatibility, load all trades but limit to recent 200 to avoid timeout
+    trades = db.query(*_TRADE_LIST_COLUMNS).order_by(desc(Trade.timestamp)).limit(200).all()
+    
+    return [
+        _trade_list_item(t) for t in trades
+    ]
+
 def get_all_trades_compatible(db: Session) -> List[Dict]:
     """Get all trades in frontend-compatible format (direct array)"""
     try:
-        from models import Trade
-        
-        # For compatibility, load all trades but limit to recent 200 to avoid timeout
-        trades = db.query(Trade).order_by(desc(Trade.timestamp)).limit(200).all()
-        
-        return [
-            {
-                "id": t.id,
-                "symbol": t.symbol,
-                "trade_type": t.trade_type,
-                "quantity": t.quantity,
-                "price": t.price,
-                "total_value": t.total_value,
-                "status": t.status,
-                "timestamp": t.timestamp.isoformat() if t.timestamp else None,
-                "profit_loss": t.profit_loss,
-                "strategy": getattr(t, 'strategy', 'MANUAL')
-            } for t in trades
-        ]
+        return _fetch_recent_trades(db)
         
     except Exception as e:
         logger.error(f"Error getting compatible trades: {str(e)}")
         return []
 
+def get_all_trades_compatible_json(db: Session) -> Tuple[bytes, bytes]:
+    """Serialized (plain, gzipped) JSON for get_all_trades_compatible, cached briefly"""
+    now = time.time()
+    
+    # Return cached bytes if still fresh
+    if (_trades_json_cache["bytes"] is not None and 
+        _trades_json_cache["timestamp"] is not None and 
+        now - _trades_json_cache["timestamp"] < TRADES_CACHE_TIMEOUT):
+        return _trades_json_cache["bytes"], _trades_json_cache["gzip"]
+    
+    try:
+        trades = _fetch_recent_trades(db)
+    except Exception as e:
+        logger.error(f"Error getting compatible trades: {str(e)}")
+        # Serve an empty list but don't cache the failure
+        data = b"[]"
+        return data, gzip.compress(data, compresslevel=6)
+    
+    data = orjson.dumps(trades)
+    compressed = gzip.compress(data, compresslevel=6)
+    
+    # Cache the result
+    _trades_json_cache["bytes"] = data
+    _trades_json_cache["gzip"] = compressed
+    _trades_json_cache["timestamp"] = now
+    
+    return data, compressed
+
+def invalidate_trades_cache():
+    """Drop the cached trade list JSON (call after any trade write)"""
+    global _trades_json_cache
+    _trades_json_cache = {"bytes": None, "gzip": None, "timestamp": None}
+
 def clear_performance_caches():
     """Clear all performance caches (useful for testing or forced refresh)"""
     global _balance_cache, _performance_cache, _trading_control_cache
     _balance_cache = {"value": None, "timestamp": None}
     _performance_cache = {"value": None, "timestamp": None}
     _trading_control_cache = {"value": None, "timestamp": None}
+    invalidate_trades_cache()
 
 # Trading Control optimizations
 _trading_control_cache = {"value": None, "timestamp": None}
@@ -258,8 +343,6 @@ def get_optimized_capital_status(db: Session, trading_service) -> Dict:
         return _trading_control_cache["value"]
     
     try:
-        from models import Trade
-        
         # Use optimized balance calculation
         total_portfolio_value = get_cached_balance(db, trading_service)
         
@@ -285,11 +368,9 @@ def get_optimized_capital_status(db: Session, trading_service) -> Dict:
         position_capacity = settings_max_positions - open_positions_count
         
         # Calculate largest position percentage
-        position_values = {}
+        position_values = defaultdict(float)
         for trade in open_trades:
             if trade.trade_type == "BUY":
-                if trade.symbol not in position_values:
-                    position_values[trade.symbol] = 0
                 position_values[trade.symbol] += trade.total_value
         
         largest_position_percent = 0
@@ -297,13 +378,11 @@ def get_optimized_capital_status(db: Session, trading_service) -> Dict:
             largest_position_value = max(position_values.values())
             largest_position_percent = (largest_position_value / total_portfolio_value) * 100
         
-        # Simplified sector allocation (avoid complex lookups)
-        tech_symbols = ["AAPL", "GOOGL", "MSFT", "META", "NVDA", "AMD", "INTC"]
-        sector_values = {"Technology": 0, "Other": 0}
+        # Simplified sector allocation via the precomputed sector map
+        sector_values = dict.fromkeys(SECTORS, 0)
         
         for symbol, value in position_values.items():
-            sector = "Technology" if symbol in tech_symbols else "Other"
-            sector_values[sector] += value
+            sector_values[SYMBOL_TO_SECTOR.get(symbol, "Other")] += value
         
         total_invested = sum(sector_values.values())
         sector_allocations = {}
@@ -348,6 +427,18 @@ def get_optimized_capital_status(db: Session, trading_service) -> Dict:
             "error": "Could not calculate capital status"
         }
 
+def get_dashboard_bundle(db: Session, trading_service) -> Dict:
+    """Balance, performance and capital status in one call (one cached balance shared by all three)"""
+    balance = get_cached_balance(db, trading_service)
+    performance = get_optimized_performance_metrics(db, trading_service)
+    capital = get_optimized_capital_status(db, trading_service)
+    
+    return {
+        "balance": balance,
+        "performance": performance,
+        "capital": capital
+    }
+
 def get_optimized_risk_assessment(db: Session, trading_service) -> Dict:
     """Optimized risk assessment with simplified calculations"""
     try:
@@ -2,7 +2,8 @@ import schedule
 import time
 import threading
 from datetime import datetime
-from sqlalchemy.orm import Session
+from typing import Optional
+from sqlalchemy.orm import Session, scoped_session
 import logging
 
 from database import SessionLocal
@@ -18,42 +19,53 @@ class DataScheduler:
         self.trading_service = TradingService()
         self.running = False
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        # Thread-local session factory; each job gets a fresh session and removes it when done
+        self.Session = scoped_session(SessionLocal)
     
     def get_db_session(self) -> Session:
-        """Get a database session"""
-        return SessionLocal()
+        """Get the database session bound to the current thread"""
+        return self.Session()
     
-    def collect_market_data(self):
+    def collect_market_data(self, db: Optional[Session] = None):
         """Collect daily market data for all tracked stocks"""
         self.logger.info("Starting daily market data collection...")
         
-        db = self.get_db_session()
+        owns_session = db is None
+        db = db or self.get_db_session()
         try:
             results = self.data_service.run_daily_data_collection(db)
             self.logger.info(f"Collected data for {len(results)} stocks")
         except Exception as e:
             self.logger.error(f"Error collecting market data: {str(e)}")
+            db.rollback()
         finally:
-            db.close()
+            if owns_session:
+                # Don't leave a transaction or stale identity map open until the next job
+                self.Session.remove()
     
-    def analyze_sentiment(self):
+    def analyze_sentiment(self, db: Optional[Session] = None):
         """Run daily sentiment analysis for all tracked stocks"""
         self.logger.info("Starting daily sentiment analysis...")
         
-        db = self.get_db_session()
+        owns_session = db is None
+        db = db or self.get_db_session()
         try:
             results = self.sentiment_service.run_daily_sentiment_analysis(db)
             self.logger.info(f"Analyzed sentiment for {len(results)} stocks")
         except Exception as e:
             self.logger.error(f"Error analyzing sentiment: {str(e)}")
+            db.rollback()
         finally:
-            db.close()
+            if owns_session:
+                # Don't leave a transaction or stale identity map open until the next job
+                self.Session.remove()
     
-    def run_trading_strategy(self):
+    def run_trading_strategy(self, db: Optional[Session] = None):
         """Run the sentiment-based trading strategy"""
         self.logger.info("Running trading strategy...")
         
-        db = self.get_db_session()
+        owns_session = db is None
+        db = db or self.get_db_session()
         try:
             result = self.trading_service.run_sentiment_strategy(db)
             if "error" not in result:
@@ -62,8 +74,11 @@ class DataScheduler:
                 self.logger.error(f"Strategy error: {result['error']}")
         except Exception as e:
             self.logger.error(f"Error running trading strategy: {str(e)}")
+            db.rollback()
         finally:
-            db.close()
+            if owns_session:
+                # Don't leave a transaction or stale identity map open until the next job
+                self.Session.remove()
     
     def setup_schedule(self):
         """Setup the daily schedule using configuration values"""
@@ -124,14 +139,11 @@ if __name__ == "__main__":
     # For testing - run once immediately
     logger.info("Running initial data collection...")
     
-    db = SessionLocal()
-    try:
-        # Collect initial data
-        scheduler.collect_market_data()
-        scheduler.analyze_sentiment()
-        scheduler.run_trading_strategy()
-    finally:
-        db.close()
+    with scheduler.Session() as db:
+        # Collect initial data on one shared session
+        scheduler.collect_market_data(db)
+        scheduler.analyze_sentiment(db)
+        scheduler.run_trading_strategy(db)
     
     # Start the scheduler
     start_scheduler()
@@ -1,6 +1,20 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_serializer, field_validator, ValidationInfo
+from pydantic.dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional, List
+from typing import Optional, List, Literal, Union, Annotated
+
+# Shared string value sets
+Action = Literal["BUY", "SELL", "HOLD"]
+RiskLevel = Literal["LOW", "MEDIUM", "HIGH"]
+Priority = Literal["LOW", "MEDIUM", "HIGH", "URGENT"]
+TradeStatus = Literal["OPEN", "CLOSED", "CANCELLED"]
+RecommendationStatus = Literal["PENDING", "APPROVED", "REJECTED", "EXPIRED"]
+PositionState = Literal["OPEN", "CLOSED", "PARTIALLY_CLOSED", "EXPIRED"]
+ExitType = Literal["STOP_LOSS", "TAKE_PROFIT", "TIME_BASED", "SENTIMENT_CHANGE", "TRAILING_STOP"]
+NotificationType = Literal[
+    "SIGNAL_GENERATED", "TRADE_APPROVED", "TRADE_REJECTED", "TRADE_EXECUTED",
+    "EXIT_TRIGGERED", "RISK_WARNING", "SETTINGS_UPDATED"
+]
 
 class TradeBase(BaseModel):
     symbol: str
@@ -9,21 +23,22 @@ class TradeBase(BaseModel):
     price: float
     strategy: str = "MANUAL"
 
-class TradeCreate(TradeBase):
-    pass
+# Create payloads add no fields; alias the base to share its schema
+TradeCreate = TradeBase
 
 class TradeResponse(TradeBase):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     total_value: float
     timestamp: datetime
-    status: str
+    status: TradeStatus
     sentiment_score: Optional[float] = None
     profit_loss: Optional[float] = None
     close_timestamp: Optional[datetime] = None
     close_price: Optional[float] = None
 
-    class Config:
-        from_attributes = True
+TradeResponseList = TypeAdapter(List[TradeResponse])
 
 class SentimentBase(BaseModel):
     symbol: str
@@ -35,11 +50,34 @@ class SentimentBase(BaseModel):
     source: str
 
 class SentimentResponse(SentimentBase):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     timestamp: datetime
 
-    class Config:
-        from_attributes = True
+SentimentResponseList = TypeAdapter(List[SentimentResponse])
+
+# Fixed-point scale for quantized sentiment scores; values in [-1, 1] fit in int16
+SENTIMENT_SCALE = 10000
+
+class QuantizedSentimentResponse(SentimentResponse):
+    """Sentiment scores on the wire as ints (score * SENTIMENT_SCALE).
+
+    Scores are read as plain floats (so an integer score such as 1 stays 1.0);
+    to parse the quantized wire format back, validate with
+    context={"quantized": True}.
+    """
+
+    @field_validator("news_sentiment", "social_sentiment", "overall_sentiment", mode="before")
+    @classmethod
+    def _dequantize(cls, v, info: ValidationInfo):
+        if info.context and info.context.get("quantized") and isinstance(v, int) and not isinstance(v, bool):
+            return v / SENTIMENT_SCALE
+        return v
+
+    @field_serializer("news_sentiment", "social_sentiment", "overall_sentiment")
+    def _quantize(self, v: float) -> int:
+        return int(round(v * SENTIMENT_SCALE))
 
 class StockDataBase(BaseModel):
     symbol: str
@@ -53,13 +91,16 @@ class StockDataBase(BaseModel):
     dividend_yield: Optional[float] = None
 
 class StockDataResponse(StockDataBase):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     timestamp: datetime
 
-    class Config:
-        from_attributes = True
+StockDataResponseList = TypeAdapter(List[StockDataResponse])
 
 class PerformanceMetricsResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     total_trades: int
     winning_trades: int
     losing_trades: int
@@ -70,12 +111,9 @@ class PerformanceMetricsResponse(BaseModel):
     max_drawdown: float
     sharpe_ratio: Optional[float] = None
 
-    class Config:
-        from_attributes = True
-
 class StrategySignal(BaseModel):
     symbol: str
-    action: str  # "BUY", "SELL", "HOLD"
+    action: Action
     confidence: float
     sentiment_score: float
     price: float
@@ -83,26 +121,29 @@ class StrategySignal(BaseModel):
 
 class TradeRecommendation(BaseModel):
     symbol: str
-    action: str  # "BUY", "SELL", "HOLD"
+    action: Action
     confidence: float
     sentiment_score: float
     current_price: float
     recommended_quantity: int
     recommended_value: float
     reasoning: str
-    risk_level: str  # "LOW", "MEDIUM", "HIGH"
+    risk_level: RiskLevel
     news_summary: str
     created_at: datetime
     expires_at: Optional[datetime] = None
     
 class TradeRecommendationResponse(TradeRecommendation):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
-    status: str  # "PENDING", "APPROVED", "REJECTED", "EXPIRED"
-    
-    class Config:
-        from_attributes = True
+    status: RecommendationStatus
+
+TradeRecommendationResponseList = TypeAdapter(List[TradeRecommendationResponse])
 
-class MarketScanResult(BaseModel):
+# Write-once record: frozen, slotted on Python 3.10+
+@dataclass(frozen=True, slots=True)
+class MarketScanResult:
     symbol: str
     company_name: str
     current_price: float
@@ -115,6 +156,7 @@ class MarketScanResult(BaseModel):
 class SentimentAnalysisRequest(BaseModel):
     symbols: List[str]
     force_refresh: bool = True
+    quantized: bool = False  # Return scores as fixed-point ints (see SENTIMENT_SCALE)
 
 class BulkSentimentResponse(BaseModel):
     results: List[SentimentResponse]
@@ -123,16 +165,68 @@ class BulkSentimentResponse(BaseModel):
     successful: int
     failed: int
 
+class QuantizedBulkSentimentResponse(BulkSentimentResponse):
+    results: List[QuantizedSentimentResponse]
+
 class GoogleLoginRequest(BaseModel):
     token: str
 
+class UserInfo(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    user_id: str  # Google account subject ID
+    email: str
+    name: str = ""
+    picture: str = ""
+    verified_email: bool = False
+
 class AuthResponse(BaseModel):
     access_token: str
     token_type: str
-    user: dict
+    user: UserInfo
 
 # Position Management Schemas
 
+# Typed strategy parameters, tagged by strategy type
+
+class ExitParameters(BaseModel):
+    model_config = ConfigDict(extra="allow")  # Keep custom keys users add
+
+    stop_loss_percentage: float
+    take_profit_percentage: float
+    max_hold_hours: int
+    position_size_percentage: float
+    trailing_stop_percentage: Optional[float] = None
+
+class SentimentParameters(ExitParameters):
+    kind: Literal["SENTIMENT"] = "SENTIMENT"
+    sentiment_threshold: float
+    min_news_count: int
+
+class MomentumParameters(ExitParameters):
+    kind: Literal["MOMENTUM"] = "MOMENTUM"
+    momentum_threshold: float
+    volume_threshold: float
+    lookback_days: int
+
+class MeanReversionParameters(ExitParameters):
+    kind: Literal["MEAN_REVERSION"] = "MEAN_REVERSION"
+    oversold_threshold: float
+    overbought_threshold: float
+    lookback_days: int
+
+class BreakoutParameters(ExitParameters):
+    kind: Literal["BREAKOUT"] = "BREAKOUT"
+    breakout_threshold: float
+    volume_confirmation: float
+    lookback_days: int
+
+StrategyParameters = TypeAdapter(Annotated[
+    Union[SentimentParameters, MomentumParameters, MeanReversionParameters, BreakoutParameters],
+    Field(discriminator="kind")
+])
+TYPED_PARAMETER_KINDS = frozenset(("SENTIMENT", "MOMENTUM", "MEAN_REVERSION", "BREAKOUT"))
+
 class StrategyBase(BaseModel):
     name: str
     strategy_type: str
@@ -140,19 +234,19 @@ class StrategyBase(BaseModel):
     parameters: dict = {}
     allocation_percentage: float = 10.0
     max_positions: int = 5
-    risk_level: str = "MEDIUM"
+    risk_level: RiskLevel = "MEDIUM"
 
-class StrategyCreate(StrategyBase):
-    pass
+StrategyCreate = StrategyBase
 
 class StrategyResponse(StrategyBase):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     is_active: bool
     created_at: datetime
     updated_at: datetime
-    
-    class Config:
-        from_attributes = True
+
+StrategyResponseList = TypeAdapter(List[StrategyResponse])
 
 class PositionBase(BaseModel):
     symbol: str
@@ -161,9 +255,11 @@ class PositionBase(BaseModel):
     position_size: float
 
 class PositionResponse(PositionBase):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     strategy_id: int
-    status: str
+    status: PositionState
     entry_timestamp: datetime
     exit_timestamp: Optional[datetime] = None
     exit_price: Optional[float] = None
@@ -174,25 +270,23 @@ class PositionResponse(PositionBase):
     max_hold_time: Optional[int] = None
     trailing_stop_percentage: Optional[float] = None
     sentiment_at_entry: Optional[float] = None
-    
-    class Config:
-        from_attributes = True
 
 class PositionExitEventResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     position_id: int
-    exit_type: str
+    exit_type: ExitType
     trigger_price: float
     quantity_closed: int
     exit_price: float
     realized_pnl: float
     timestamp: datetime
     reason: str
-    
-    class Config:
-        from_attributes = True
 
 class StrategyPerformanceResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
+
     id: int
     strategy_id: int
     date: datetime
@@ -213,9 +307,19 @@ class StrategyPerformanceResponse(BaseModel):
     allocated_capital: float
     utilized_capital: float
     available_capital: float
-    
-    class Config:
-        from_attributes = True
+
+class PositionSummaryItem(BaseModel):
+    id: int
+    symbol: str
+    strategy: str
+    entry_price: float
+    current_price: float
+    quantity: int
+    status: PositionState
+    unrealized_pnl: Optional[float] = None
+    realized_pnl: Optional[float] = None
+    entry_timestamp: datetime
+    exit_timestamp: Optional[datetime] = None
 
 class PositionSummaryResponse(BaseModel):
     total_positions: int
@@ -224,11 +328,11 @@ class PositionSummaryResponse(BaseModel):
     total_invested: float
     total_unrealized_pnl: float
     total_realized_pnl: float
-    positions: List[dict]
+    positions: List[PositionSummaryItem]
 
 class ExitConditionRequest(BaseModel):
     position_id: int
-    exit_type: str
+    exit_type: ExitType
     reason: str = ""
     partial_quantity: Optional[int] = None
 
@@ -266,18 +370,33 @@ class TradingControlSettings(BaseModel):
     require_confirmation: bool = True  # Require manual confirmation before trades
     enable_notifications: bool = True  # Send notifications for trade events
 
-class TradeSignalPreview(BaseModel):
+class TradeRiskAssessment(BaseModel):
+    risk_level: RiskLevel
+    position_size_percent: float
+    max_allowed_percent: float
+    violates_position_limit: bool
+    sentiment_strength: float
+    confidence_level: RiskLevel
+
+class CapitalImpact(BaseModel):
+    available_before: float
+    available_after: float
+    reserve_cash_maintained: float
+    position_size_percent: float
+
+@dataclass(frozen=True, slots=True)
+class TradeSignalPreview:
     signal_id: str  # Unique identifier for this signal
     symbol: str
-    action: str  # BUY, SELL
+    action: Action
     quantity: int
     estimated_price: float
     estimated_total: float
     reasoning: str
     confidence: float
     sentiment_score: float
-    risk_assessment: Dict[str, Any]
-    capital_impact: Dict[str, float]  # Shows available capital before/after
+    risk_assessment: TradeRiskAssessment
+    capital_impact: CapitalImpact  # Shows available capital before/after
     created_at: datetime
     expires_at: datetime  # Signals expire after some time
 
@@ -303,44 +422,64 @@ class CapitalAllocationStatus(BaseModel):
     largest_position_percent: float
     sector_allocations: Dict[str, float]
 
-class ExitSignalPreview(BaseModel):
+@dataclass(frozen=True, slots=True)
+class ExitSignalPreview:
     signal_id: str
     position_id: int
     symbol: str
-    action: str = "SELL"
     quantity: int
     estimated_price: float
     estimated_total: float
     estimated_pnl: float
     exit_reason: str
-    urgency: str  # LOW, MEDIUM, HIGH
+    urgency: RiskLevel
     created_at: datetime
+    action: Action = "SELL"
     expires_at: Optional[datetime] = None  # Some exits (stop loss) don't expire
 
 class TradingNotification(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     id: str
-    type: str  # SIGNAL_GENERATED, TRADE_EXECUTED, EXIT_TRIGGERED, RISK_WARNING
+    type: NotificationType
     title: str
     message: str
     symbol: Optional[str] = None
-    priority: str  # LOW, MEDIUM, HIGH, URGENT
+    priority: Priority
     action_required: bool = False
     action_url: Optional[str] = None
     created_at: datetime
     read: bool = False
 
+class PortfolioMetrics(BaseModel):
+    total_return: float
+    win_rate: float
+    total_trades: int
+    average_trade: float = 0.0
+
+class PositionConcentration(BaseModel):
+    max_position_percent: float
+    positions_over_5_percent: int
+
+class VolatilityAnalysis(BaseModel):
+    portfolio_beta: float
+
 class RiskAssessmentResponse(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     overall_risk_score: float  # 0-10 scale
     warnings: List[str]
     recommendations: List[str]
-    portfolio_metrics: Dict[str, float]
-    position_concentration: Dict[str, float]
+    portfolio_metrics: PortfolioMetrics
+    position_concentration: PositionConcentration
     sector_concentration: Dict[str, float]
-    volatility_analysis: Dict[str, Any]
+    volatility_analysis: VolatilityAnalysis
 
 # ADAPTIVE LEARNING SCHEMAS
 
 class TradePatternResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     pattern_type: str
     symbol: str
@@ -351,11 +490,12 @@ class TradePatternResponse(BaseModel):
     occurrence_count: int
     pattern_strength: float
     created_at: datetime
-    
-    class Config:
-        from_attributes = True
+
+TradePatternResponseList = TypeAdapter(List[TradePatternResponse])
 
 class StrategyLearningResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     parameter_name: str
     old_value: float
@@ -365,11 +505,12 @@ class StrategyLearningResponse(BaseModel):
     is_successful: Optional[bool]
     improvement_score: float
     adjustment_date: datetime
-    
-    class Config:
-        from_attributes = True
+
+StrategyLearningResponseList = TypeAdapter(List[StrategyLearningResponse])
 
 class LearningInsightResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     insight_type: str
     title: str
@@ -380,9 +521,8 @@ class LearningInsightResponse(BaseModel):
     current_effectiveness: float
     is_active: bool
     discovered_at: datetime
-    
-    class Config:
-        from_attributes = True
+
+LearningInsightResponseList = TypeAdapter(List[LearningInsightResponse])
 
 class AdaptiveLearningResults(BaseModel):
     patterns_discovered: int
@@ -11,13 +11,14 @@ The system learns from every trade to improve future performance.
 """
 
 import logging
+import time
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_, desc
-from collections import defaultdict
+from sqlalchemy.engine import Row
+from sqlalchemy import func, and_, or_, desc, case, insert
 import json
 
 from models import (
@@ -25,13 +26,48 @@ from models import (
     TradePattern, StrategyLearning, LearningInsight, PerformanceBaseline
 )
 from services.data_service import DataService
+from services.sentiment_service import SentimentService
 from config import config
 
+# Simplified symbol classifications
+TECH_SYMBOLS = frozenset(["AAPL", "GOOGL", "MSFT", "META", "NVDA", "AMD", "INTC", "CRM", "ORCL", "ADBE"])
+LARGE_CAP_SYMBOLS = frozenset(["AAPL", "GOOGL", "MSFT", "META", "NVDA", "AMZN"])
+SYMBOL_TO_SECTOR: Dict[str, str] = {symbol: "Technology" for symbol in TECH_SYMBOLS}
+
+# Market data shared across learning runs; daily closes only change once a day
+_market_data_cache: Dict[str, Dict] = {}
+MARKET_DATA_CACHE_TIMEOUT = 3600  # 1 hour
+
+# Learning dashboard summary; polled by the frontend, changes only when a learning run writes
+_dashboard_cache = {"value": None, "timestamp": None}
+DASHBOARD_CACHE_TIMEOUT = 15  # seconds
+
+# Recommendation text for each actionable insight type
+RECOMMENDATION_TEMPLATES = {
+    "SECTOR_TREND": "Consider increasing allocation to {sector} sector based on strong performance patterns",
+    "TIMING_PATTERN": "Optimize holding periods: {description}",
+    "MARKET_CONDITION": "Sentiment strategy: {description}"
+}
+
+# Trade columns the learning analyses read
+LEARNING_TRADE_COLUMNS = (
+    Trade.id, Trade.symbol, Trade.trade_type, Trade.price, Trade.total_value,
+    Trade.profit_loss, Trade.timestamp, Trade.close_timestamp
+)
+
+
+def _pnl_stats(pnl: np.ndarray) -> Tuple[float, float]:
+    """Win rate and mean of a P&L array"""
+    if pnl.size == 0:
+        return 0.0, 0.0
+    return float(np.count_nonzero(pnl > 0)) / pnl.size, float(pnl.mean())
+
 
 class AdaptiveLearningService:
     def __init__(self):
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         self.data_service = DataService()
+        self.sentiment_service = SentimentService()
         
         # Learning parameters
         self.min_trades_for_pattern = 5  # Minimum trades to establish a pattern
@@ -39,11 +75,20 @@ class AdaptiveLearningService:
         self.confidence_threshold_for_changes = 0.7  # Confidence required to make changes
         self.max_parameter_adjustment = 0.2  # Maximum % change per adjustment
         
+        # Per-run lookup caches keyed by symbol, cleared after each learning run
+        self._run_cache = {"market": {}}
+        
+        # Reference time frozen for the duration of a learning run
+        self._run_time: Optional[datetime] = None
+        
     def analyze_and_learn(self, db: Session) -> Dict[str, Any]:
         """Main learning function - analyzes all trade data and updates strategy"""
         try:
             self.logger.info("Starting adaptive learning analysis...")
             
+            # Every cutoff and timestamp in this run is relative to the same instant
+            self._run_time = datetime.now()
+            
             results = {
                 "patterns_discovered": 0,
                 "parameters_adjusted": 0,
@@ -52,12 +97,25 @@ class AdaptiveLearningService:
                 "recommendations": []
             }
             
+            # Load the 90-day closed-trade window once; the 30-day window is a slice of it
+            trades_90d = self._load_closed_trades(db, self._run_time - timedelta(days=90))
+            cutoff_30d = self._run_time - timedelta(days=30)
+            # Timestamps come back timezone-aware on PostgreSQL; compare like with like
+            cutoff_30d_aware = cutoff_30d.astimezone()
+            trades_30d = [
+                t for t in trades_90d
+                if t.timestamp >= (cutoff_30d_aware if t.timestamp.tzinfo else cutoff_30d)
+            ]
+            
+            # Sentiment for every trade in the window, matched in one query
+            sentiment_by_trade = self._get_sentiment_for_trades(db, trades_90d)
+            
             # Step 1: Extract patterns from recent trades
-            patterns = self._extract_trade_patterns(db)
+            patterns = self._extract_trade_patterns(db, trades_90d, sentiment_by_trade)
             results["patterns_discovered"] = len(patterns)
             
             # Step 2: Analyze strategy performance and adjust parameters
-            adjustments = self._analyze_and_adjust_strategy_parameters(db)
+            adjustments = self._analyze_and_adjust_strategy_parameters(db, trades_30d, sentiment_by_trade)
             results["parameters_adjusted"] = len(adjustments)
             
             # Step 3: Generate high-level insights
@@ -78,41 +136,76 @@ class AdaptiveLearningService:
         except Exception as e:
             self.logger.error(f"Error in adaptive learning analysis: {str(e)}")
             raise
+        
+        finally:
+            # Don't carry market data or the run time over to the next run
+            for cache in self._run_cache.values():
+                cache.clear()
+            self._run_time = None
+            
+            # The run may have written patterns, adjustments and insights
+            _dashboard_cache["timestamp"] = None
+    
+    def _now(self) -> datetime:
+        """The current learning run's frozen time, or the wall clock outside a run"""
+        return self._run_time or datetime.now()
     
-    def _extract_trade_patterns(self, db: Session) -> List[Dict]:
-        """Extract patterns from successful and unsuccessful trades"""
+    def _load_closed_trades(self, db: Session, since: datetime) -> List[Row]:
+        """Closed trades with a realized P&L since the given time, as lightweight column rows"""
+        # Plain rows (with Trade-style attribute access) avoid ORM hydration and aren't
+        # expired by the commits made later in the run
+        return db.query(*LEARNING_TRADE_COLUMNS).filter(
+            Trade.status == "CLOSED",
+            Trade.profit_loss.isnot(None),
+            Trade.timestamp >= since
+        ).all()
+    
+    def _extract_trade_patterns(self, db: Session, recent_trades: Optional[List[Trade]] = None,
+                                sentiment_by_trade: Optional[Dict[int, Dict]] = None) -> List[Dict]:
+        """Extract patterns from successful and unsuccessful trades (last 90 days unless given)"""
         try:
-            # Get recent closed trades with sufficient data
-            recent_trades = db.query(Trade).filter(
-                Trade.status == "CLOSED",
-                Trade.profit_loss.isnot(None),
-                Trade.timestamp >= datetime.now() - timedelta(days=90)
-            ).all()
+            if recent_trades is None:
+                recent_trades = self._load_closed_trades(db, self._now() - timedelta(days=90))
             
             if len(recent_trades) < self.min_trades_for_pattern:
                 self.logger.info(f"Not enough trades ({len(recent_trades)}) to extract patterns")
                 return []
             
-            patterns_created = []
+            pattern_rows = []
+            
+            # Fetch sentiment for all trades in one query, price history once per symbol
+            if sentiment_by_trade is None:
+                sentiment_by_trade = self._get_sentiment_for_trades(db, recent_trades)
+            price_changes_by_trade = self._get_price_changes_for_trades(recent_trades)
+            
+            # Strategy settings in effect for this run, read once and recorded on every pattern
+            settings = {
+                "confidence_threshold": config.CONFIDENCE_THRESHOLD,
+                "position_size_percent": config.MAX_POSITION_SIZE * 100,
+                "buy_sentiment_threshold": config.BUY_SENTIMENT_THRESHOLD,
+                "sell_sentiment_threshold": config.SELL_SENTIMENT_THRESHOLD
+            }
             
             for trade in recent_trades:
                 try:
                     # Get market context at trade time
-                    market_context = self._get_market_context_for_trade(db, trade)
+                    market_context = self._get_market_context_for_trade(
+                        db, trade, sentiment_by_trade.get(trade.id), price_changes_by_trade.get(trade.id)
+                    )
                     
                     # Determine if this was a successful trade
                     is_successful = trade.profit_loss > 0
                     pattern_type = "SUCCESSFUL_ENTRY" if is_successful else "FAILED_ENTRY"
                     
-                    # Create or update pattern
-                    pattern = self._create_or_update_pattern(db, trade, market_context, pattern_type)
-                    if pattern:
-                        patterns_created.append(pattern)
+                    pattern_rows.append(self._build_pattern_row(trade, market_context, pattern_type, settings))
                         
                 except Exception as e:
                     self.logger.warning(f"Error processing trade {trade.id} for patterns: {str(e)}")
                     continue
             
+            # Merge all trades into new/existing patterns in one pass
+            patterns_created = self._upsert_patterns(db, pattern_rows)
+            
             self.logger.info(f"Extracted {len(patterns_created)} trade patterns")
             return patterns_created
             
@@ -120,32 +213,106 @@ class AdaptiveLearningService:
             self.logger.error(f"Error extracting trade patterns: {str(e)}")
             return []
     
-    def _get_market_context_for_trade(self, db: Session, trade: Trade) -> Dict:
+    def _get_sentiment_for_trades(self, db: Session, trades: List[Trade]) -> Dict[int, Dict]:
+        """Latest sentiment within 24h before each trade, keyed by trade id (one query per call)"""
+        if not trades:
+            return {}
+        
+        trades_df = pd.DataFrame(
+            [(t.id, t.symbol, t.timestamp) for t in trades],
+            columns=["trade_id", "symbol", "timestamp"]
+        )
+        
+        sentiment_df = self.sentiment_service.recent_window(
+            db,
+            trades_df["symbol"].unique().tolist(),
+            trades_df["timestamp"].min().to_pydatetime() - timedelta(hours=24),
+            trades_df["timestamp"].max().to_pydatetime()
+        )
+        
+        if sentiment_df.empty:
+            return {}
+        
+        # Match each trade to the most recent sentiment at or before it, at most 24h old
+        merged = pd.merge_asof(
+            trades_df.sort_values("timestamp"),
+            sentiment_df.sort_values("timestamp"),
+            on="timestamp",
+            by="symbol",
+            direction="backward",
+            tolerance=pd.Timedelta(hours=24)
+        ).dropna(subset=["overall_sentiment"]).fillna({"news_count": 0, "social_count": 0})
+        
+        return {
+            int(row.trade_id): {
+                "overall_sentiment": float(row.overall_sentiment),
+                "news_count": int(row.news_count),
+                "social_count": int(row.social_count)
+            }
+            for row in merged.itertuples(index=False)
+        }
+    
+    def _get_run_market_data(self, symbol: str) -> Dict:
+        """30-day market data for a symbol, fetched at most once per learning run"""
+        market_cache = self._run_cache["market"]
+        if symbol not in market_cache:
+            market_cache[symbol] = self._get_cached_market_data(symbol)
+        return market_cache[symbol]
+    
+    def _get_cached_market_data(self, symbol: str) -> Dict:
+        """30-day market data shared across learning runs for MARKET_DATA_CACHE_TIMEOUT"""
+        now = time.time()
+        cached = _market_data_cache.get(symbol)
+        if cached is not None and now - cached["timestamp"] < MARKET_DATA_CACHE_TIMEOUT:
+            return cached["value"]
+        
+        market_data = self.data_service.get_market_data(symbol, days=30)
+        
+        # Only cache successful fetches so a transient failure is retried next run
+        if "error" not in market_data:
+            _market_data_cache[symbol] = {"value": market_data, "timestamp": now}
+        
+        return market_data
+    
+    def _get_price_changes_for_trades(self, trades: List[Trade]) -> Dict[int, Tuple[float, float, float]]:
+        """1d/5d/30d % change of each trade price vs recent closes, keyed by trade id"""
+        if not trades:
+            return {}
+        
+        symbols = sorted({t.symbol for t in trades})
+        symbol_index = {symbol: i for i, symbol in enumerate(symbols)}
+        
+        # Reference closes per symbol: last, 5th from last, first (NaN when history is too short)
+        reference_closes = np.full((len(symbols), 3), np.nan)
+        for i, symbol in enumerate(symbols):
+            try:
+                market_data = self._get_run_market_data(symbol)
+                closes = np.array([h["close"] for h in market_data.get("historical_data") or []], dtype=float)
+            except Exception as e:
+                self.logger.warning(f"Error getting price history for {symbol}: {str(e)}")
+                continue
+            
+            if closes.size >= 1:
+                reference_closes[i, 0] = closes[-1]
+            if closes.size >= 5:
+                reference_closes[i, 1] = closes[-5]
+            if closes.size >= 30:
+                reference_closes[i, 2] = closes[0]
+        
+        reference_closes[reference_closes <= 0] = np.nan
+        
+        trade_refs = reference_closes[[symbol_index[t.symbol] for t in trades]]
+        prices = np.array([t.price for t in trades], dtype=float)[:, None]
+        changes = np.where(np.isnan(trade_refs), 0.0, (prices - trade_refs) / trade_refs * 100)
+        
+        return {t.id: tuple(row) for t, row in zip(trades, changes.tolist())}
+    
+    def _get_market_context_for_trade(self, db: Session, trade: Trade, sentiment: Optional[Dict] = None,
+                                      price_changes: Optional[Tuple[float, float, float]] = None) -> Dict:
         """Get market context (sentiment, price trends, etc.) for a trade"""
         try:
-            # Get sentiment data near trade time
-            sentiment = db.query(SentimentData).filter(
-                SentimentData.symbol == trade.symbol,
-                SentimentData.timestamp <= trade.timestamp,
-                SentimentData.timestamp >= trade.timestamp - timedelta(hours=24)
-            ).order_by(desc(SentimentData.timestamp)).first()
-            
-            # Get price trend data
-            market_data = self.data_service.get_market_data(trade.symbol, days=30)
-            
-            # Calculate price trends
-            price_change_1d = 0
-            price_change_5d = 0
-            price_change_30d = 0
-            
-            if "historical_data" in market_data and market_data["historical_data"]:
-                hist_data = market_data["historical_data"]
-                if len(hist_data) >= 1:
-                    price_change_1d = ((trade.price - hist_data[-1]["close"]) / hist_data[-1]["close"]) * 100
-                if len(hist_data) >= 5:
-                    price_change_5d = ((trade.price - hist_data[-5]["close"]) / hist_data[-5]["close"]) * 100
-                if len(hist_data) >= 30:
-                    price_change_30d = ((trade.price - hist_data[0]["close"]) / hist_data[0]["close"]) * 100
+            # Price changes vs recent closes (precomputed per run)
+            price_change_1d, price_change_5d, price_change_30d = price_changes or (0.0, 0.0, 0.0)
             
             # Determine trends
             price_trend = "SIDEWAYS"
@@ -163,10 +330,10 @@ class AdaptiveLearningService:
                 volatility_level = "LOW"
             
             return {
-                "sentiment_score": sentiment.overall_sentiment if sentiment else 0.0,
-                "sentiment_strength": abs(sentiment.overall_sentiment) if sentiment else 0.0,
-                "news_count": sentiment.news_count if sentiment else 0,
-                "social_count": sentiment.social_count if sentiment else 0,
+                "sentiment_score": sentiment["overall_sentiment"] if sentiment else 0.0,
+                "sentiment_strength": abs(sentiment["overall_sentiment"]) if sentiment else 0.0,
+                "news_count": sentiment["news_count"] if sentiment else 0,
+                "social_count": sentiment["social_count"] if sentiment else 0,
                 "price_trend": price_trend,
                 "volume_trend": volume_trend,
                 "volatility_level": volatility_level,
@@ -181,108 +348,127 @@ class AdaptiveLearningService:
             self.logger.warning(f"Error getting market context for trade {trade.id}: {str(e)}")
             return {}
     
-    def _create_or_update_pattern(self, db: Session, trade: Trade, market_context: Dict, pattern_type: str) -> Optional[Dict]:
-        """Create or update a trade pattern in the database"""
+    def _build_pattern_row(self, trade: Trade, market_context: Dict, pattern_type: str, settings: Dict) -> Dict:
+        """TradePattern column values describing a single trade"""
+        # Calculate hold duration
+        hold_duration = 0
+        if trade.close_timestamp and trade.timestamp:
+            hold_duration = (trade.close_timestamp - trade.timestamp).days
+        
+        return {
+            "pattern_type": pattern_type,
+            "symbol": trade.symbol,
+            "sector": market_context.get("sector", "Unknown"),
+            "market_cap_range": market_context.get("market_cap_range", "UNKNOWN"),
+            "volatility_level": market_context.get("volatility_level", "MEDIUM"),
+            
+            "sentiment_score": market_context.get("sentiment_score", 0.0),
+            "sentiment_strength": market_context.get("sentiment_strength", 0.0),
+            "news_count": market_context.get("news_count", 0),
+            "social_count": market_context.get("social_count", 0),
+            
+            "price_trend": market_context.get("price_trend", "SIDEWAYS"),
+            "volume_trend": market_context.get("volume_trend", "NORMAL"),
+            "price_change_1d": market_context.get("price_change_1d", 0.0),
+            "price_change_5d": market_context.get("price_change_5d", 0.0),
+            "price_change_30d": market_context.get("price_change_30d", 0.0),
+            
+            "profit_loss": trade.profit_loss,
+            "profit_loss_percent": (trade.profit_loss / trade.total_value) * 100 if trade.total_value > 0 else 0,
+            "hold_duration_days": hold_duration,
+            
+            **settings
+        }
+    
+    def _upsert_patterns(self, db: Session, pattern_rows: List[Dict]) -> List[Dict]:
+        """Aggregate per-trade rows by pattern key and merge them into TradePattern with one commit"""
+        if not pattern_rows:
+            return []
+        
         try:
-            # Calculate hold duration
-            hold_duration = 0
-            if trade.close_timestamp and trade.timestamp:
-                hold_duration = (trade.close_timestamp - trade.timestamp).days
-            
-            # Look for existing similar pattern
-            existing_pattern = db.query(TradePattern).filter(
-                TradePattern.symbol == trade.symbol,
-                TradePattern.pattern_type == pattern_type,
-                TradePattern.sentiment_score.between(
-                    market_context.get("sentiment_score", 0) - 0.1,
-                    market_context.get("sentiment_score", 0) + 0.1
-                ),
-                TradePattern.price_trend == market_context.get("price_trend", "SIDEWAYS"),
-                TradePattern.volatility_level == market_context.get("volatility_level", "MEDIUM")
-            ).first()
-            
-            if existing_pattern:
-                # Update existing pattern
-                existing_pattern.occurrence_count += 1
+            # Sentiment is bucketed to 0.1 so similar trades share a pattern
+            key_columns = ["symbol", "pattern_type", "sentiment_bucket", "price_trend", "volatility_level"]
+            
+            df = pd.DataFrame(pattern_rows)
+            df["sentiment_bucket"] = df["sentiment_score"].round(1)
+            df["is_win"] = df["pattern_type"].str.startswith("SUCCESSFUL")
+            
+            grouped = df.groupby(key_columns, sort=False)
+            stats = grouped.agg(
+                count=("profit_loss", "size"),
+                wins=("is_win", "sum"),
+                pnl_sum=("profit_loss", "sum"),
+                pnl_percent=("profit_loss_percent", "mean")
+            )
+            # Descriptive columns come from the first trade seen for each pattern
+            summary = grouped.first().drop(columns=["is_win"]).join(stats).reset_index()
+            
+            # Load candidate existing patterns in one query
+            existing_by_key = {}
+            for pattern in db.query(TradePattern).filter(
+                TradePattern.symbol.in_(df["symbol"].unique().tolist()),
+                TradePattern.pattern_type.in_(df["pattern_type"].unique().tolist())
+            ).all():
+                # np.round, like Series.round above, so boundary scores (0.35, 0.45) land in the same bucket
+                key = (pattern.symbol, pattern.pattern_type, float(np.round(pattern.sentiment_score or 0.0, 1)),
+                       pattern.price_trend, pattern.volatility_level)
+                existing_by_key.setdefault(key, pattern)
+            
+            updates = []
+            new_rows = []
+            results = []
+            now = self._now()
+            
+            for row in summary.to_dict("records"):
+                count, wins, pnl_sum = row.pop("count"), row.pop("wins"), row.pop("pnl_sum")
+                pnl_percent = row.pop("pnl_percent")
+                key = tuple(row.pop(c) if c == "sentiment_bucket" else row[c] for c in key_columns)
+                existing_pattern = existing_by_key.get(key)
                 
-                # Update success rate
-                if pattern_type.startswith("SUCCESSFUL"):
-                    existing_pattern.success_rate = (
-                        existing_pattern.success_rate * (existing_pattern.occurrence_count - 1) + 1
-                    ) / existing_pattern.occurrence_count
+                if existing_pattern:
+                    # Fold this run's trades into the running means: a += (sum(x) - count * a) / n
+                    n = (existing_pattern.occurrence_count or 0) + count
+                    success_rate = existing_pattern.success_rate or 0.0
+                    avg_profit = existing_pattern.profit_loss or 0.0
+                    updates.append({
+                        "id": existing_pattern.id,
+                        "occurrence_count": n,
+                        "success_rate": success_rate + (wins - count * success_rate) / n,
+                        "profit_loss": avg_profit + (pnl_sum - count * avg_profit) / n,
+                        "updated_at": now
+                    })
+                    results.append({"action": "updated", "pattern_id": existing_pattern.id})
                 else:
-                    existing_pattern.success_rate = (
-                        existing_pattern.success_rate * (existing_pattern.occurrence_count - 1)
-                    ) / existing_pattern.occurrence_count
-                
-                # Update average profit/loss
-                existing_pattern.profit_loss = (
-                    existing_pattern.profit_loss * (existing_pattern.occurrence_count - 1) + trade.profit_loss
-                ) / existing_pattern.occurrence_count
-                
-                existing_pattern.updated_at = datetime.now()
-                
-                db.commit()
-                return {"action": "updated", "pattern_id": existing_pattern.id}
-                
-            else:
-                # Create new pattern
-                new_pattern = TradePattern(
-                    pattern_type=pattern_type,
-                    symbol=trade.symbol,
-                    sector=market_context.get("sector", "Unknown"),
-                    market_cap_range=market_context.get("market_cap_range", "UNKNOWN"),
-                    volatility_level=market_context.get("volatility_level", "MEDIUM"),
-                    
-                    sentiment_score=market_context.get("sentiment_score", 0.0),
-                    sentiment_strength=market_context.get("sentiment_strength", 0.0),
-                    news_count=market_context.get("news_count", 0),
-                    social_count=market_context.get("social_count", 0),
-                    
-                    price_trend=market_context.get("price_trend", "SIDEWAYS"),
-                    volume_trend=market_context.get("volume_trend", "NORMAL"),
-                    price_change_1d=market_context.get("price_change_1d", 0.0),
-                    price_change_5d=market_context.get("price_change_5d", 0.0),
-                    price_change_30d=market_context.get("price_change_30d", 0.0),
-                    
-                    profit_loss=trade.profit_loss,
-                    profit_loss_percent=(trade.profit_loss / trade.total_value) * 100 if trade.total_value > 0 else 0,
-                    hold_duration_days=hold_duration,
-                    
-                    confidence_threshold=config.CONFIDENCE_THRESHOLD,
-                    position_size_percent=config.MAX_POSITION_SIZE * 100,
-                    buy_sentiment_threshold=config.BUY_SENTIMENT_THRESHOLD,
-                    sell_sentiment_threshold=config.SELL_SENTIMENT_THRESHOLD,
-                    
-                    success_rate=1.0 if pattern_type.startswith("SUCCESSFUL") else 0.0
-                )
-                
-                db.add(new_pattern)
-                db.commit()
-                db.refresh(new_pattern)
-                
-                return {"action": "created", "pattern_id": new_pattern.id}
-                
+                    row.update(
+                        profit_loss=pnl_sum / count,
+                        profit_loss_percent=pnl_percent,
+                        occurrence_count=count,
+                        success_rate=wins / count
+                    )
+                    new_rows.append(row)
+                    results.append({"action": "created", "symbol": row["symbol"], "pattern_type": row["pattern_type"]})
+            
+            if updates:
+                db.bulk_update_mappings(TradePattern, updates)
+            if new_rows:
+                # Core executemany: one batched multi-row INSERT, no ORM objects
+                db.execute(insert(TradePattern), new_rows)
+            db.commit()
+            
+            return results
+            
         except Exception as e:
-            self.logger.error(f"Error creating/updating pattern: {str(e)}")
+            self.logger.error(f"Error saving trade patterns: {str(e)}")
             db.rollback()
-            return None
+            return []
     
-    def _analyze_and_adjust_strategy_parameters(self, db: Session) -> List[Dict]:
-        """Analyze performance and adjust strategy parameters for better results"""
+    def _analyze_and_adjust_strategy_parameters(self, db: Session, recent_trades: List[Trade],
+                                                sentiment_by_trade: Optional[Dict[int, Dict]] = None) -> List[Dict]:
+        """Analyze recent closed trades and adjust strategy parameters for better results"""
         try:
-            adjustments_made = []
-            
-            # Get recent performance data
-            recent_trades = db.query(Trade).filter(
-                Trade.status == "CLOSED",
-                Trade.profit_loss.isnot(None),
-                Trade.timestamp >= datetime.now() - timedelta(days=30)
-            ).all()
-            
             if len(recent_trades) < self.min_sample_size_for_adjustment:
                 self.logger.info(f"Not enough recent trades ({len(recent_trades)}) for parameter adjustment")
-                return adjustments_made
+                return []
             
             # Calculate current performance metrics
             current_metrics = self._calculate_performance_metrics(recent_trades)
@@ -290,69 +476,65 @@ class AdaptiveLearningService:
             # Get baseline performance for comparison
             baseline = self._get_or_create_baseline(db, "OVERALL")
             
-            # Analyze specific areas for improvement
-            potential_adjustments = []
-            
-            # 1. Confidence threshold adjustment
-            if current_metrics["win_rate"] < baseline.win_rate * 0.9:  # Win rate dropped significantly
-                confidence_adjustment = self._analyze_confidence_threshold(db, recent_trades)
-                if confidence_adjustment:
-                    potential_adjustments.append(confidence_adjustment)
-            
-            # 2. Sentiment threshold adjustment
-            sentiment_adjustment = self._analyze_sentiment_thresholds(db, recent_trades)
-            if sentiment_adjustment:
-                potential_adjustments.append(sentiment_adjustment)
+            # Columnar view of the trades with their sentiment (fetched in one query)
+            if sentiment_by_trade is None:
+                sentiment_by_trade = self._get_sentiment_for_trades(db, recent_trades)
+            trades_df = pd.DataFrame(recent_trades, columns=[c.key for c in LEARNING_TRADE_COLUMNS])
+            trades_df["sentiment_score"] = trades_df["id"].map(
+                {trade_id: s["overall_sentiment"] for trade_id, s in sentiment_by_trade.items()}
+            )
             
-            # 3. Position sizing adjustment
-            position_adjustment = self._analyze_position_sizing(db, recent_trades, current_metrics)
-            if position_adjustment:
-                potential_adjustments.append(position_adjustment)
+            # Analyze specific areas for improvement; the confidence threshold is only
+            # revisited when the win rate dropped significantly
+            potential_adjustments = self._analyze_all_parameters(
+                trades_df, check_confidence=current_metrics["win_rate"] < baseline.win_rate * 0.9
+            )
             
             # Apply adjustments that meet confidence criteria
-            for adjustment in potential_adjustments:
-                if adjustment["confidence"] >= self.confidence_threshold_for_changes:
-                    applied_adjustment = self._apply_parameter_adjustment(db, adjustment)
-                    if applied_adjustment:
-                        adjustments_made.append(applied_adjustment)
-            
-            return adjustments_made
+            return self._apply_parameter_adjustments(db, [
+                adjustment for adjustment in potential_adjustments
+                if adjustment["confidence"] >= self.confidence_threshold_for_changes
+            ])
             
         except Exception as e:
             self.logger.error(f"Error analyzing strategy parameters: {str(e)}")
             return []
     
-    def _analyze_confidence_threshold(self, db: Session, recent_trades: List[Trade]) -> Optional[Dict]:
+    def _analyze_all_parameters(self, trades_df: pd.DataFrame, check_confidence: bool = True) -> List[Dict]:
+        """Candidate parameter adjustments from one trades + sentiment DataFrame"""
+        total_value = trades_df["total_value"]
+        df = trades_df.assign(
+            is_win=trades_df["profit_loss"] > 0,
+            sentiment_strength=trades_df["sentiment_score"].abs(),
+            # Position size buckets: > 4% / < 2% of 100k
+            size_bucket=np.where(total_value > 4000, "large", np.where(total_value < 2000, "small", "mid")),
+            sentiment_bucket=pd.cut(
+                trades_df["sentiment_score"],
+                bins=[0, 0.2, 0.4, np.inf],
+                labels=["slightly_positive", "positive", "very_positive"]
+            )
+        )
+        
+        analyses = [self._analyze_sentiment_thresholds, self._analyze_position_sizing]
+        if check_confidence:
+            analyses.insert(0, self._analyze_confidence_threshold)
+        
+        return [adjustment for adjustment in (analyze(df) for analyze in analyses) if adjustment]
+    
+    def _analyze_confidence_threshold(self, df: pd.DataFrame) -> Optional[Dict]:
         """Analyze if confidence threshold should be adjusted"""
         try:
             # Group trades by confidence level (approximate from sentiment strength)
-            high_confidence_trades = []
-            low_confidence_trades = []
+            scored = df[df["sentiment_strength"].notna()]
+            pnl = scored["profit_loss"].to_numpy(dtype=float)
+            high_confidence = (scored["sentiment_strength"] > 0.6).to_numpy()  # High confidence proxy
             
-            for trade in recent_trades:
-                # Get sentiment for this trade
-                sentiment = db.query(SentimentData).filter(
-                    SentimentData.symbol == trade.symbol,
-                    SentimentData.timestamp <= trade.timestamp,
-                    SentimentData.timestamp >= trade.timestamp - timedelta(hours=24)
-                ).order_by(desc(SentimentData.timestamp)).first()
-                
-                if sentiment:
-                    sentiment_strength = abs(sentiment.overall_sentiment)
-                    if sentiment_strength > 0.6:  # High confidence proxy
-                        high_confidence_trades.append(trade)
-                    else:
-                        low_confidence_trades.append(trade)
-            
-            if len(high_confidence_trades) < 3 or len(low_confidence_trades) < 3:
+            if np.count_nonzero(high_confidence) < 3 or np.count_nonzero(~high_confidence) < 3:
                 return None
             
             # Calculate performance for each group
-            high_conf_win_rate = sum(1 for t in high_confidence_trades if t.profit_loss > 0) / len(high_confidence_trades)
-            low_conf_win_rate = sum(1 for t in low_confidence_trades if t.profit_loss > 0) / len(low_confidence_trades)
-            
-            high_conf_avg_profit = sum(t.profit_loss for t in high_confidence_trades) / len(high_confidence_trades)
-            low_conf_avg_profit = sum(t.profit_loss for t in low_confidence_trades) / len(low_confidence_trades)
+            high_conf_win_rate, high_conf_avg_profit = _pnl_stats(pnl[high_confidence])
+            low_conf_win_rate, low_conf_avg_profit = _pnl_stats(pnl[~high_confidence])
             
             # Determine if adjustment is needed
             if high_conf_win_rate > low_conf_win_rate + 0.1 and high_conf_avg_profit > low_conf_avg_profit:
@@ -373,55 +555,35 @@ class AdaptiveLearningService:
             self.logger.error(f"Error analyzing confidence threshold: {str(e)}")
             return None
     
-    def _analyze_sentiment_thresholds(self, db: Session, recent_trades: List[Trade]) -> Optional[Dict]:
+    def _analyze_sentiment_thresholds(self, df: pd.DataFrame) -> Optional[Dict]:
         """Analyze if sentiment thresholds should be adjusted"""
         try:
-            buy_trades = [t for t in recent_trades if t.trade_type == "BUY"]
+            buy_trades = df[df["trade_type"] == "BUY"]
             
             if len(buy_trades) < 5:
                 return None
             
             # Analyze performance by sentiment ranges
-            sentiment_performance = defaultdict(list)
-            
-            for trade in buy_trades:
-                sentiment = db.query(SentimentData).filter(
-                    SentimentData.symbol == trade.symbol,
-                    SentimentData.timestamp <= trade.timestamp,
-                    SentimentData.timestamp >= trade.timestamp - timedelta(hours=24)
-                ).order_by(desc(SentimentData.timestamp)).first()
-                
-                if sentiment:
-                    score = sentiment.overall_sentiment
-                    if score > 0.4:
-                        sentiment_performance["very_positive"].append(trade.profit_loss)
-                    elif score > 0.2:
-                        sentiment_performance["positive"].append(trade.profit_loss)
-                    elif score > 0:
-                        sentiment_performance["slightly_positive"].append(trade.profit_loss)
+            stats = buy_trades.groupby("sentiment_bucket", observed=True).agg(
+                avg_profit=("profit_loss", "mean"),
+                win_rate=("is_win", "mean"),
+                n=("profit_loss", "size")
+            )
+            stats = stats[stats["n"] >= 3]
+            performance_score = stats["avg_profit"] * stats["win_rate"]
             
             # Find the optimal sentiment threshold
-            best_threshold = config.BUY_SENTIMENT_THRESHOLD
-            best_performance = 0
-            
-            for threshold_name, profits in sentiment_performance.items():
-                if len(profits) >= 3:
-                    avg_profit = sum(profits) / len(profits)
-                    win_rate = sum(1 for p in profits if p > 0) / len(profits)
-                    performance_score = avg_profit * win_rate
-                    
-                    if performance_score > best_performance:
-                        best_performance = performance_score
-                        if threshold_name == "very_positive":
-                            best_threshold = 0.4
-                        elif threshold_name == "positive":
-                            best_threshold = 0.2
+            current_threshold = config.BUY_SENTIMENT_THRESHOLD
+            best_threshold = current_threshold
+            if not performance_score.empty and performance_score.max() > 0:
+                bucket_thresholds = {"very_positive": 0.4, "positive": 0.2}
+                best_threshold = bucket_thresholds.get(performance_score.idxmax(), current_threshold)
             
             # If we found a better threshold, suggest adjustment
-            if abs(best_threshold - config.BUY_SENTIMENT_THRESHOLD) > 0.05:
+            if abs(best_threshold - current_threshold) > 0.05:
                 return {
                     "parameter": "buy_sentiment_threshold",
-                    "current_value": config.BUY_SENTIMENT_THRESHOLD,
+                    "current_value": current_threshold,
                     "new_value": best_threshold,
                     "reason": f"Sentiment threshold {best_threshold} shows better performance",
                     "confidence": 0.7,
@@ -434,25 +596,25 @@ class AdaptiveLearningService:
             self.logger.error(f"Error analyzing sentiment thresholds: {str(e)}")
             return None
     
-    def _analyze_position_sizing(self, db: Session, recent_trades: List[Trade], current_metrics: Dict) -> Optional[Dict]:
+    def _analyze_position_sizing(self, df: pd.DataFrame) -> Optional[Dict]:
         """Analyze if position sizing should be adjusted"""
         try:
             # Analyze position sizes and their outcomes
-            large_positions = [t for t in recent_trades if t.total_value > 4000]  # > 4% of 100k
-            small_positions = [t for t in recent_trades if t.total_value < 2000]  # < 2% of 100k
-            
-            if len(large_positions) < 3 or len(small_positions) < 3:
+            stats = df.groupby("size_bucket").agg(
+                win_rate=("is_win", "mean"),
+                avg_profit=("profit_loss", "mean"),
+                avg_value=("total_value", "mean"),
+                n=("profit_loss", "size")
+            ).reindex(["large", "small"])
+            
+            if (stats["n"].fillna(0) < 3).any():
                 return None
             
-            large_pos_win_rate = sum(1 for t in large_positions if t.profit_loss > 0) / len(large_positions)
-            small_pos_win_rate = sum(1 for t in small_positions if t.profit_loss > 0) / len(small_positions)
-            
-            large_pos_avg_profit = sum(t.profit_loss for t in large_positions) / len(large_positions)
-            small_pos_avg_profit = sum(t.profit_loss for t in small_positions) / len(small_positions)
-            
             # Risk-adjusted performance
-            large_pos_risk_adj = large_pos_avg_profit / (sum(t.total_value for t in large_positions) / len(large_positions))
-            small_pos_risk_adj = small_pos_avg_profit / (sum(t.total_value for t in small_positions) / len(small_positions))
+            stats["risk_adj"] = stats["avg_profit"] / stats["avg_value"]
+            
+            large_pos_win_rate, small_pos_win_rate = stats["win_rate"].tolist()
+            large_pos_risk_adj, small_pos_risk_adj = stats["risk_adj"].tolist()
             
             # Determine optimal position size
             if small_pos_risk_adj > large_pos_risk_adj * 1.2 and small_pos_win_rate > large_pos_win_rate:
@@ -473,22 +635,36 @@ class AdaptiveLearningService:
             self.logger.error(f"Error analyzing position sizing: {str(e)}")
             return None
     
-    def _apply_parameter_adjustment(self, db: Session, adjustment: Dict) -> Optional[Dict]:
-        """Apply a parameter adjustment and record it"""
+    def _apply_parameter_adjustments(self, db: Session, adjustments: List[Dict]) -> List[Dict]:
+        """Record parameter adjustments in one batch, then apply them"""
+        if not adjustments:
+            return []
+        
         try:
-            # Record the adjustment
-            learning_record = StrategyLearning(
-                strategy_id=1,  # Default strategy
-                parameter_name=adjustment["parameter"],
-                old_value=adjustment["current_value"],
-                new_value=adjustment["new_value"],
-                adjustment_reason=adjustment["reason"],
-                confidence_level=adjustment["confidence"]
-            )
+            # Record the adjustments
+            learning_records = [
+                StrategyLearning(
+                    strategy_id=1,  # Default strategy
+                    parameter_name=adjustment["parameter"],
+                    old_value=adjustment["current_value"],
+                    new_value=adjustment["new_value"],
+                    adjustment_reason=adjustment["reason"],
+                    confidence_level=adjustment["confidence"]
+                )
+                for adjustment in adjustments
+            ]
             
-            db.add(learning_record)
+            # return_defaults so the generated ids can be reported back
+            db.bulk_save_objects(learning_records, return_defaults=True)
             db.commit()
             
+        except Exception as e:
+            self.logger.error(f"Error applying parameter adjustments: {str(e)}")
+            db.rollback()
+            return []
+        
+        applied = []
+        for adjustment, learning_record in zip(adjustments, learning_records):
             # Apply the adjustment to config (in production, this would update persistent config)
             if adjustment["parameter"] == "confidence_threshold":
                 config.CONFIDENCE_THRESHOLD = adjustment["new_value"]
@@ -499,39 +675,41 @@ class AdaptiveLearningService:
             
             self.logger.info(f"Applied parameter adjustment: {adjustment['parameter']} = {adjustment['new_value']}")
             
-            return {
+            applied.append({
                 "parameter": adjustment["parameter"],
                 "old_value": adjustment["current_value"],
                 "new_value": adjustment["new_value"],
                 "reason": adjustment["reason"],
                 "learning_record_id": learning_record.id
-            }
-            
-        except Exception as e:
-            self.logger.error(f"Error applying parameter adjustment: {str(e)}")
-            db.rollback()
-            return None
+            })
+        
+        return applied
     
     def _generate_market_insights(self, db: Session) -> List[Dict]:
         """Generate high-level market insights from patterns"""
         try:
-            insights_created = []
-            
             # Get successful patterns to analyze
-            successful_patterns = db.query(TradePattern).filter(
+            successful_filter = (
                 TradePattern.pattern_type.like("SUCCESSFUL%"),
                 TradePattern.occurrence_count >= 3,
                 TradePattern.success_rate >= 0.6
-            ).all()
+            )
+            successful_patterns = pd.DataFrame(
+                db.query(TradePattern).filter(*successful_filter).with_entities(
+                    TradePattern.sentiment_strength, TradePattern.success_rate
+                ).all(),
+                columns=["sentiment_strength", "success_rate"]
+            )
             
-            # Group patterns by various dimensions
-            sector_insights = self._analyze_sector_patterns(successful_patterns)
-            timing_insights = self._analyze_timing_patterns(successful_patterns)
+            # Group patterns by various dimensions (sector and timing are aggregated in SQL)
+            sector_insights = self._analyze_sector_patterns(db, successful_filter)
+            timing_insights = self._analyze_timing_patterns(db, successful_filter)
             sentiment_insights = self._analyze_sentiment_patterns(successful_patterns)
             
-            # Create insight records
-            for insight_data in sector_insights + timing_insights + sentiment_insights:
-                insight = LearningInsight(
+            # Create insight records in one batch
+            insights_created = sector_insights + timing_insights + sentiment_insights
+            db.bulk_save_objects([
+                LearningInsight(
                     insight_type=insight_data["type"],
                     title=insight_data["title"],
                     description=insight_data["description"],
@@ -541,10 +719,8 @@ class AdaptiveLearningService:
                     impact_magnitude=insight_data["impact"],
                     supporting_trades_count=insight_data["supporting_trades"]
                 )
-                
-                db.add(insight)
-                insights_created.append(insight_data)
-            
+                for insight_data in insights_created
+            ])
             db.commit()
             
             self.logger.info(f"Generated {len(insights_created)} market insights")
@@ -554,51 +730,63 @@ class AdaptiveLearningService:
             self.logger.error(f"Error generating market insights: {str(e)}")
             return []
     
-    def _analyze_sector_patterns(self, patterns: List[TradePattern]) -> List[Dict]:
+    def _analyze_sector_patterns(self, db: Session, pattern_filter: Tuple) -> List[Dict]:
         """Analyze patterns by sector"""
-        sector_performance = defaultdict(list)
-        
-        for pattern in patterns:
-            if pattern.sector and pattern.sector != "Unknown":
-                sector_performance[pattern.sector].append({
-                    "success_rate": pattern.success_rate,
-                    "avg_profit": pattern.profit_loss,
-                    "count": pattern.occurrence_count
-                })
+        sector_stats = db.query(
+            TradePattern.sector,
+            func.avg(TradePattern.success_rate).label("avg_success_rate"),
+            func.avg(TradePattern.profit_loss).label("avg_profit"),
+            func.sum(TradePattern.occurrence_count).label("total_trades")
+        ).filter(
+            *pattern_filter,
+            TradePattern.sector.isnot(None),
+            TradePattern.sector != "",
+            TradePattern.sector != "Unknown"
+        ).group_by(
+            TradePattern.sector
+        ).having(
+            func.count() >= 2  # At least 2 patterns in this sector
+        ).all()
         
         insights = []
-        for sector, data in sector_performance.items():
-            if len(data) >= 2:  # At least 2 patterns in this sector
-                avg_success_rate = sum(d["success_rate"] for d in data) / len(data)
-                avg_profit = sum(d["avg_profit"] for d in data) / len(data)
-                total_trades = sum(d["count"] for d in data)
-                
-                if avg_success_rate > 0.7 and avg_profit > 0:
-                    insights.append({
-                        "type": "SECTOR_TREND",
-                        "title": f"{sector} Sector Shows Strong Performance",
-                        "description": f"{sector} sector demonstrates {avg_success_rate:.1%} success rate with average profit of ${avg_profit:.2f}",
-                        "sectors": [sector],
-                        "confidence": min(avg_success_rate, 0.9),
-                        "impact": avg_profit / 100.0,  # Normalize impact
-                        "supporting_trades": total_trades
-                    })
+        for sector, avg_success_rate, avg_profit, total_trades in sector_stats:
+            if avg_success_rate > 0.7 and avg_profit > 0:
+                insights.append({
+                    "type": "SECTOR_TREND",
+                    "title": f"{sector} Sector Shows Strong Performance",
+                    "description": f"{sector} sector demonstrates {avg_success_rate:.1%} success rate with average profit of ${avg_profit:.2f}",
+                    "sectors": [sector],
+                    "confidence": min(avg_success_rate, 0.9),
+                    "impact": avg_profit / 100.0,  # Normalize impact
+                    "supporting_trades": total_trades
+                })
         
         return insights
     
-    def _analyze_timing_patterns(self, patterns: List[TradePattern]) -> List[Dict]:
+    def _analyze_timing_patterns(self, db: Session, pattern_filter: Tuple) -> List[Dict]:
         """Analyze patterns by timing"""
         # This is a simplified version - in practice, you'd analyze day of week, time of day, etc.
         insights = []
         
         # Analyze hold duration patterns
-        short_term = [p for p in patterns if p.hold_duration_days <= 3]
-        long_term = [p for p in patterns if p.hold_duration_days >= 10]
+        hold_bucket = case(
+            (TradePattern.hold_duration_days <= 3, "short"),
+            (TradePattern.hold_duration_days >= 10, "long")
+        ).label("hold_bucket")
+        duration_stats = {
+            bucket: (avg_success, count)
+            for bucket, avg_success, count in db.query(
+                hold_bucket,
+                func.avg(TradePattern.success_rate),
+                func.count()
+            ).filter(*pattern_filter).group_by(hold_bucket).all()
+            if bucket is not None
+        }
         
-        if len(short_term) >= 3 and len(long_term) >= 3:
-            short_success = sum(p.success_rate for p in short_term) / len(short_term)
-            long_success = sum(p.success_rate for p in long_term) / len(long_term)
-            
+        short_success, short_count = duration_stats.get("short", (0.0, 0))
+        long_success, long_count = duration_stats.get("long", (0.0, 0))
+        
+        if short_count >= 3 and long_count >= 3:
             if short_success > long_success + 0.1:
                 insights.append({
                     "type": "TIMING_PATTERN",
@@ -606,21 +794,27 @@ class AdaptiveLearningService:
                     "description": f"Positions held 3 days or less show {short_success:.1%} success vs {long_success:.1%} for longer holds",
                     "confidence": 0.7,
                     "impact": short_success - long_success,
-                    "supporting_trades": len(short_term) + len(long_term)
+                    "supporting_trades": short_count + long_count
                 })
         
         return insights
     
-    def _analyze_sentiment_patterns(self, patterns: List[TradePattern]) -> List[Dict]:
+    def _analyze_sentiment_patterns(self, patterns: pd.DataFrame) -> List[Dict]:
         """Analyze patterns by sentiment levels"""
         insights = []
         
-        high_sentiment = [p for p in patterns if p.sentiment_strength > 0.6]
-        medium_sentiment = [p for p in patterns if 0.3 < p.sentiment_strength <= 0.6]
+        # Tabulate by sentiment strength level: 0 = high (> 0.6), 1 = medium (0.3, 0.6], 2 = other
+        strength = patterns["sentiment_strength"].to_numpy(dtype=float, na_value=np.nan)
+        success_rate = patterns["success_rate"].to_numpy(dtype=float, na_value=np.nan)
+        levels = np.where(strength > 0.6, 0, np.where(strength > 0.3, 1, 2))
+        
+        counts = np.bincount(levels, minlength=3)
+        success_sums = np.bincount(levels, weights=success_rate, minlength=3)
+        high_count, medium_count = int(counts[0]), int(counts[1])
         
-        if len(high_sentiment) >= 3 and len(medium_sentiment) >= 3:
-            high_success = sum(p.success_rate for p in high_sentiment) / len(high_sentiment)
-            medium_success = sum(p.success_rate for p in medium_sentiment) / len(medium_sentiment)
+        if high_count >= 3 and medium_count >= 3:
+            high_success = float(success_sums[0]) / high_count
+            medium_success = float(success_sums[1]) / medium_count
             
             if high_success > medium_success + 0.15:
                 insights.append({
@@ -629,7 +823,7 @@ class AdaptiveLearningService:
                     "description": f"High sentiment strength (>0.6) shows {high_success:.1%} success vs {medium_success:.1%} for medium sentiment",
                     "confidence": 0.8,
                     "impact": high_success - medium_success,
-                    "supporting_trades": len(high_sentiment) + len(medium_sentiment)
+                    "supporting_trades": high_count + medium_count
                 })
         
         return insights
@@ -642,24 +836,42 @@ class AdaptiveLearningService:
             # Update overall baseline
             overall_baseline = self._get_or_create_baseline(db, "OVERALL")
             
-            # Get recent performance
-            recent_trades = db.query(Trade).filter(
+            # Get recent performance, aggregated by the database
+            is_win = Trade.profit_loss > 0
+            is_loss = Trade.profit_loss < 0
+            profit_sum = func.sum(case((is_win, Trade.profit_loss), else_=0))
+            loss_sum_expr = func.sum(case((is_loss, Trade.profit_loss), else_=0))
+            (total_trades, win_count, total_profit, loss_count, loss_sum, profit_factor,
+             period_start, period_end) = db.query(
+                func.count(Trade.id),
+                func.sum(case((is_win, 1), else_=0)),
+                profit_sum,
+                func.sum(case((is_loss, 1), else_=0)),
+                loss_sum_expr,
+                # NULL when there are no losses
+                profit_sum / func.nullif(-loss_sum_expr, 0),
+                func.min(Trade.timestamp),
+                func.max(Trade.timestamp)
+            ).filter(
                 Trade.status == "CLOSED",
                 Trade.profit_loss.isnot(None),
-                Trade.timestamp >= datetime.now() - timedelta(days=30)
-            ).all()
+                Trade.timestamp >= self._now() - timedelta(days=30)
+            ).one()
             
-            if len(recent_trades) >= 10:
-                metrics = self._calculate_performance_metrics(recent_trades)
+            if total_trades >= 10:
+                metrics = self._metrics_from_totals(
+                    total_trades, win_count, float(total_profit), loss_count, float(loss_sum),
+                    profit_factor=float(profit_factor) if profit_factor is not None else float('inf')
+                )
                 
                 # Update baseline with recent performance
                 overall_baseline.win_rate = metrics["win_rate"]
                 overall_baseline.avg_profit = metrics["avg_profit"]
                 overall_baseline.avg_loss = metrics["avg_loss"]
                 overall_baseline.profit_factor = metrics["profit_factor"]
-                overall_baseline.total_trades = len(recent_trades)
-                overall_baseline.period_start = recent_trades[0].timestamp
-                overall_baseline.period_end = recent_trades[-1].timestamp
+                overall_baseline.total_trades = total_trades
+                overall_baseline.period_start = period_start
+                overall_baseline.period_end = period_end
                 
                 db.commit()
                 baselines_updated.append({"type": "OVERALL", "baseline_id": overall_baseline.id})
@@ -685,8 +897,8 @@ class AdaptiveLearningService:
                 avg_loss=0.0,
                 profit_factor=1.0,
                 total_trades=0,
-                period_start=datetime.now() - timedelta(days=30),
-                period_end=datetime.now()
+                period_start=self._now() - timedelta(days=30),
+                period_end=self._now()
             )
             db.add(baseline)
             db.commit()
@@ -699,16 +911,37 @@ class AdaptiveLearningService:
         if not trades:
             return {"win_rate": 0, "avg_profit": 0, "avg_loss": 0, "profit_factor": 1}
         
-        winning_trades = [t for t in trades if t.profit_loss > 0]
-        losing_trades = [t for t in trades if t.profit_loss < 0]
+        if len(trades) < 64:
+            # NumPy call overhead outweighs the vectorized math for short lists
+            pnl = [t.profit_loss for t in trades]
+            wins = [p for p in pnl if p > 0]
+            losses = [p for p in pnl if p < 0]
+            return self._metrics_from_totals(len(pnl), len(wins), sum(wins), len(losses), sum(losses))
         
-        win_rate = len(winning_trades) / len(trades)
-        avg_profit = sum(t.profit_loss for t in winning_trades) / len(winning_trades) if winning_trades else 0
-        avg_loss = sum(t.profit_loss for t in losing_trades) / len(losing_trades) if losing_trades else 0
+        pnl = np.fromiter((t.profit_loss for t in trades), dtype=np.float64, count=len(trades))
+        is_win = pnl > 0
+        is_loss = pnl < 0
+        
+        # Masked reductions sum in place instead of copying pnl[mask] first
+        return self._metrics_from_totals(
+            pnl.size, int(np.count_nonzero(is_win)), float(pnl.sum(where=is_win)),
+            int(np.count_nonzero(is_loss)), float(pnl.sum(where=is_loss))
+        )
+    
+    def _metrics_from_totals(self, total_count: int, win_count: int, total_profit: float,
+                             loss_count: int, loss_sum: float,
+                             profit_factor: Optional[float] = None) -> Dict:
+        """Performance metrics from trade counts and P&L sums split by winners and losers.
         
-        total_profit = sum(t.profit_loss for t in winning_trades)
-        total_loss = abs(sum(t.profit_loss for t in losing_trades))
-        profit_factor = total_profit / total_loss if total_loss > 0 else float('inf')
+        profit_factor may be supplied when the database has already computed it.
+        """
+        win_rate = win_count / total_count
+        avg_profit = total_profit / win_count if win_count else 0
+        avg_loss = loss_sum / loss_count if loss_count else 0
+        
+        if profit_factor is None:
+            total_loss = abs(loss_sum)
+            profit_factor = total_profit / total_loss if total_loss > 0 else float('inf')
         
         return {
             "win_rate": win_rate,
@@ -719,67 +952,92 @@ class AdaptiveLearningService:
     
     def _generate_learning_recommendations(self, db: Session) -> List[str]:
         """Generate actionable recommendations based on learning analysis"""
-        recommendations = []
+        max_recommendations = 5
+        since = self._now() - timedelta(days=7)
         
-        # Get recent insights
-        recent_insights = db.query(LearningInsight).filter(
-            LearningInsight.discovered_at >= datetime.now() - timedelta(days=7),
-            LearningInsight.confidence_score >= 0.7
-        ).all()
+        # Get recent insights (only the columns the templates use)
+        recent_insights = db.query(
+            LearningInsight.insight_type,
+            LearningInsight.description,
+            LearningInsight.sectors_affected
+        ).filter(
+            LearningInsight.discovered_at >= since,
+            LearningInsight.confidence_score >= 0.7,
+            LearningInsight.insight_type.in_(list(RECOMMENDATION_TEMPLATES))
+        ).limit(max_recommendations).all()
         
-        for insight in recent_insights:
-            if insight.insight_type == "SECTOR_TREND":
-                recommendations.append(f"Consider increasing allocation to {insight.sectors_affected[0]} sector based on strong performance patterns")
-            elif insight.insight_type == "TIMING_PATTERN":
-                recommendations.append(f"Optimize holding periods: {insight.description}")
-            elif insight.insight_type == "MARKET_CONDITION":
-                recommendations.append(f"Sentiment strategy: {insight.description}")
+        recommendations = [
+            RECOMMENDATION_TEMPLATES[insight_type].format(
+                sector=(sectors_affected or [None])[0], description=description
+            )
+            for insight_type, description, sectors_affected in recent_insights
+        ]
         
         # Add parameter adjustment recommendations
-        recent_adjustments = db.query(StrategyLearning).filter(
-            StrategyLearning.adjustment_date >= datetime.now() - timedelta(days=7)
-        ).all()
-        
-        for adj in recent_adjustments:
-            recommendations.append(f"Monitor impact of {adj.parameter_name} adjustment from {adj.old_value} to {adj.new_value}")
+        if len(recommendations) < max_recommendations:
+            recent_adjustments = db.query(
+                StrategyLearning.parameter_name,
+                StrategyLearning.old_value,
+                StrategyLearning.new_value
+            ).filter(
+                StrategyLearning.adjustment_date >= since
+            ).limit(max_recommendations - len(recommendations)).all()
+            
+            recommendations.extend(
+                f"Monitor impact of {parameter_name} adjustment from {old_value} to {new_value}"
+                for parameter_name, old_value, new_value in recent_adjustments
+            )
         
-        return recommendations[:5]  # Limit to top 5 recommendations
+        return recommendations
     
     def _get_symbol_sector(self, symbol: str) -> str:
         """Get sector for a symbol (simplified mapping)"""
-        tech_symbols = ["AAPL", "GOOGL", "MSFT", "META", "NVDA", "AMD", "INTC", "CRM", "ORCL", "ADBE"]
-        if symbol in tech_symbols:
-            return "Technology"
-        return "Other"
+        return SYMBOL_TO_SECTOR.get(symbol, "Other")
     
     def _get_market_cap_range(self, symbol: str) -> str:
         """Get market cap range for a symbol (simplified)"""
-        large_cap = ["AAPL", "GOOGL", "MSFT", "META", "NVDA", "AMZN"]
-        if symbol in large_cap:
-            return "LARGE"
-        return "MID"
+        return "LARGE" if symbol in LARGE_CAP_SYMBOLS else "MID"
 
     def get_learning_dashboard_data(self, db: Session) -> Dict[str, Any]:
-        """Get comprehensive learning data for dashboard display"""
+        """Get comprehensive learning data for dashboard display (cached briefly)"""
+        now = time.time()
+        if (_dashboard_cache["value"] is not None and
+            _dashboard_cache["timestamp"] is not None and
+            now - _dashboard_cache["timestamp"] < DASHBOARD_CACHE_TIMEOUT):
+            return _dashboard_cache["value"]
+        
         try:
-            # Recent patterns - ensure we're getting accurate count
-            recent_patterns_count = db.query(TradePattern).filter(
-                TradePattern.created_at >= datetime.now() - timedelta(days=30)
-            ).count()
-            
-            # Total patterns ever discovered for verification
-            total_patterns_count = db.query(TradePattern).count()
-            
-            # Parameter adjustments
-            recent_adjustments = db.query(StrategyLearning).filter(
-                StrategyLearning.adjustment_date >= datetime.now() - timedelta(days=30)
-            ).all()
-            
-            # Active insights
-            active_insights = db.query(LearningInsight).filter(
-                LearningInsight.is_active == True,
-                LearningInsight.confidence_score >= 0.7
-            ).all()
+            cutoff = datetime.now() - timedelta(days=30)
+            adjustments_filter = StrategyLearning.adjustment_date >= cutoff
+            insights_filter = (LearningInsight.is_active == True, LearningInsight.confidence_score >= 0.7)
+            
+            # All dashboard counts in a single round trip
+            counts = db.query(
+                db.query(func.count(TradePattern.id)).filter(
+                    TradePattern.created_at >= cutoff
+                ).scalar_subquery().label("recent_patterns"),
+                db.query(func.count(TradePattern.id)).scalar_subquery().label("total_patterns"),
+                db.query(func.count(StrategyLearning.id)).filter(
+                    adjustments_filter
+                ).scalar_subquery().label("adjustments"),
+                db.query(func.count(LearningInsight.id)).filter(
+                    *insights_filter
+                ).scalar_subquery().label("insights")
+            ).one()
+            recent_patterns_count = counts.recent_patterns
+            total_patterns_count = counts.total_patterns
+            adjustments_count = counts.adjustments
+            active_insights_count = counts.insights
+            
+            # Five most recent parameter adjustments (shown oldest first)
+            recent_adjustments = db.query(StrategyLearning).filter(adjustments_filter).order_by(
+                desc(StrategyLearning.adjustment_date), desc(StrategyLearning.id)
+            ).limit(5).all()[::-1]
+            
+            # Three most confident active insights
+            top_insights = db.query(LearningInsight).filter(*insights_filter).order_by(
+                desc(LearningInsight.confidence_score)
+            ).limit(3).all()
             
             # Performance improvement
             current_baseline = self._get_or_create_baseline(db, "OVERALL")
@@ -787,14 +1045,14 @@ class AdaptiveLearningService:
             # Log for debugging data consistency
             self.logger.info(f"Dashboard data: {recent_patterns_count} recent patterns, {total_patterns_count} total patterns")
             
-            return {
+            dashboard_data = {
                 "patterns_discovered_30d": recent_patterns_count,
                 "total_patterns_ever": total_patterns_count,
-                "parameter_adjustments_30d": len(recent_adjustments),
-                "active_insights": len(active_insights),
+                "parameter_adjustments_30d": adjustments_count,
+                "active_insights": active_insights_count,
                 "current_win_rate": current_baseline.win_rate,
                 "current_profit_factor": current_baseline.profit_factor,
-                "learning_system_active": total_patterns_count > 0 or len(recent_adjustments) > 0,
+                "learning_system_active": total_patterns_count > 0 or adjustments_count > 0,
                 "data_source": "database",
                 "recent_adjustments": [
                     {
@@ -803,7 +1061,7 @@ class AdaptiveLearningService:
                         "new_value": adj.new_value,
                         "reason": adj.adjustment_reason,
                         "date": adj.adjustment_date.strftime("%Y-%m-%d")
-                    } for adj in recent_adjustments[-5:]
+                    } for adj in recent_adjustments
                 ],
                 "top_insights": [
                     {
@@ -811,10 +1069,15 @@ class AdaptiveLearningService:
                         "description": insight.description,
                         "confidence": insight.confidence_score,
                         "impact": insight.impact_magnitude
-                    } for insight in active_insights[:3]
+                    } for insight in top_insights
                 ]
             }
             
+            _dashboard_cache["value"] = dashboard_data
+            _dashboard_cache["timestamp"] = now
+            
+            return dashboard_data
+            
         except Exception as e:
             self.logger.error(f"Error getting learning dashboard data: {str(e)}")
             return {
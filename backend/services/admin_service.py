@@ -1,11 +1,15 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_, desc, asc, text
+from sqlalchemy import func, and_, or_, desc, asc, text, tuple_, select, cast, Date
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+import csv
+import gzip
 import json
 import logging
 import psutil
 import os
+import threading
+import time
 from pathlib import Path
 
 from models import Trade, SentimentData, StockData, TradeRecommendation
@@ -13,32 +17,117 @@ from models_admin import (
     User, UserActivity, SystemMetrics, SystemAlerts, 
     FeatureFlags, SystemConfiguration, DataExports
 )
-from database import engine
+from database import engine, SessionLocal
 
 logger = logging.getLogger(__name__)
 
+RESOURCE_SAMPLE_INTERVAL = 2  # seconds between CPU/memory/disk samples
+STATS_CACHE_TIMEOUT = 15  # seconds; dashboard polling doesn't need fresher counts
+
+EXPORT_DIR = Path(os.getenv("EXPORT_DIR", "exports"))
+EXPORT_BATCH_SIZE = 10000  # rows fetched and written per chunk
+
+# Export type -> (columns, timestamp column used for start_date/end_date filters)
+EXPORT_SOURCES = {
+    "users": (
+        (User.id, User.email, User.name, User.is_active, User.is_admin,
+         User.last_login, User.created_at),
+        User.created_at
+    ),
+    "trades": (
+        (Trade.id, Trade.symbol, Trade.trade_type, Trade.quantity, Trade.price,
+         Trade.total_value, Trade.status, Trade.profit_loss, Trade.timestamp,
+         Trade.close_timestamp),
+        Trade.timestamp
+    ),
+    "sentiment": (
+        (SentimentData.id, SentimentData.symbol, SentimentData.overall_sentiment,
+         SentimentData.news_sentiment, SentimentData.social_sentiment,
+         SentimentData.news_count, SentimentData.social_count,
+         SentimentData.source, SentimentData.timestamp),
+        SentimentData.timestamp
+    ),
+    "system_metrics": (
+        (SystemMetrics.id, SystemMetrics.metric_name, SystemMetrics.metric_value,
+         SystemMetrics.metric_unit, SystemMetrics.timestamp),
+        SystemMetrics.timestamp
+    ),
+}
+
 class AdminService:
     """Service for admin console functionality"""
     
     def __init__(self):
         self.logger = logger
+        
+        # Short-lived results for dashboard-polled queries: key -> (timestamp, value)
+        self._cache: Dict[str, tuple] = {}
+        
+        # Latest (cpu_percent, virtual_memory, disk_usage) sample, refreshed in the background
+        # so health checks never block on psutil.cpu_percent(interval=1)
+        self._resource_sample = None
+        self._resource_lock = threading.Lock()
+        psutil.cpu_percent(interval=None)  # Prime the CPU counter; the first reading is meaningless
+        sampler_thread = threading.Thread(target=self._sample_resources_loop, daemon=True)
+        sampler_thread.start()
+    
+    def _read_resources(self):
+        """Take a non-blocking CPU/memory/disk sample"""
+        return psutil.cpu_percent(interval=None), psutil.virtual_memory(), psutil.disk_usage('/')
+    
+    def _sample_resources_loop(self):
+        """Refresh the system resource sample every RESOURCE_SAMPLE_INTERVAL seconds"""
+        while True:
+            time.sleep(RESOURCE_SAMPLE_INTERVAL)
+            try:
+                sample = self._read_resources()
+            except Exception as e:
+                self.logger.warning(f"System resource sampling failed: {e}")
+                continue
+            with self._resource_lock:
+                self._resource_sample = sample
+    
+    def get_system_resources(self):
+        """Latest (cpu_percent, virtual_memory, disk_usage) sample"""
+        with self._resource_lock:
+            sample = self._resource_sample
+        # Before the first background sample lands, read directly (still non-blocking)
+        return sample if sample is not None else self._read_resources()
+    
+    def _cached(self, key: str, ttl: float, compute):
+        """Return the cached value for key if younger than ttl seconds, else recompute it"""
+        now = time.monotonic()
+        cached = self._cache.get(key)
+        if cached is not None and now - cached[0] < ttl:
+            return cached[1]
+        
+        value = compute()
+        self._cache[key] = (now, value)
+        return value
     
     # User Management
     def get_user_stats(self, db: Session) -> Dict[str, Any]:
-        """Get comprehensive user statistics"""
+        """Get comprehensive user statistics (cached for STATS_CACHE_TIMEOUT seconds)"""
+        return self._cached("user_stats", STATS_CACHE_TIMEOUT, lambda: self._query_user_stats(db))
+    
+    def _query_user_stats(self, db: Session) -> Dict[str, Any]:
+        """Compute user statistics from the database"""
         total_users = db.query(User).count()
         active_users = db.query(User).filter(User.is_active == True).count()
         
+        # One reference time so every window ends at the same instant
+        now = datetime.utcnow()
+        
         # Users registered in last 30 days
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
+        thirty_days_ago = now - timedelta(days=30)
         new_users = db.query(User).filter(User.created_at >= thirty_days_ago).count()
         
         # Users active in last 7 days
-        seven_days_ago = datetime.utcnow() - timedelta(days=7)
+        seven_days_ago = now - timedelta(days=7)
         weekly_active = db.query(User).filter(User.last_login >= seven_days_ago).count()
         
         # Users active in last 24 hours
-        yesterday = datetime.utcnow() - timedelta(days=1)
+        yesterday = now - timedelta(days=1)
         daily_active = db.query(User).filter(User.last_login >= yesterday).count()
         
         return {
@@ -51,56 +140,56 @@ class AdminService:
         }
     
     def get_users(self, db: Session, limit: int = 50, offset: int = 0, 
-                  search: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Get paginated list of users with search"""
-        query = db.query(User)
+                  search: Optional[str] = None, after_created_at: Optional[datetime] = None,
+                  after_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get paginated list of users with search.
+        
+        Pass the (created_at, id) of the last user on the previous page as
+        after_created_at/after_id for keyset pagination; offset is still
+        accepted for older clients but scans every skipped row.
+        """
+        query = db.query(
+            User.id, User.email, User.name, User.is_active, User.is_admin,
+            User.last_login, User.created_at, User.picture_url
+        )
         
         if search:
+            # Match the search text literally: escape LIKE wildcards typed by the admin
+            escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            pattern = f"%{escaped}%"
             query = query.filter(
                 or_(
-                    User.email.ilike(f"%{search}%"),
-                    User.name.ilike(f"%{search}%")
+                    User.email.ilike(pattern, escape="\\"),
+                    User.name.ilike(pattern, escape="\\")
                 )
             )
         
-        users = query.order_by(desc(User.created_at)).offset(offset).limit(limit).all()
+        query = query.order_by(desc(User.created_at), desc(User.id))
         
-        return [
-            {
-                "id": user.id,
-                "email": user.email,
-                "name": user.name,
-                "is_active": user.is_active,
-                "is_admin": user.is_admin,
-                "last_login": user.last_login,
-                "created_at": user.created_at,
-                "picture_url": user.picture_url
-            }
-            for user in users
-        ]
+        if after_created_at is not None and after_id is not None:
+            query = query.filter(tuple_(User.created_at, User.id) < tuple_(after_created_at, after_id))
+        elif offset:
+            query = query.offset(offset)
+        
+        users = query.limit(limit).all()
+        
+        return [dict(user._mapping) for user in users]
     
     def get_user_activity(self, db: Session, user_id: Optional[int] = None, 
                          limit: int = 100) -> List[Dict[str, Any]]:
         """Get user activity logs"""
-        query = db.query(UserActivity)
+        query = db.query(
+            UserActivity.id, UserActivity.user_id, UserActivity.action, UserActivity.endpoint,
+            UserActivity.ip_address, UserActivity.timestamp,
+            UserActivity.action_metadata.label("metadata")
+        )
         
         if user_id:
             query = query.filter(UserActivity.user_id == user_id)
         
         activities = query.order_by(desc(UserActivity.timestamp)).limit(limit).all()
         
-        return [
-            {
-                "id": activity.id,
-                "user_id": activity.user_id,
-                "action": activity.action,
-                "endpoint": activity.endpoint,
-                "ip_address": activity.ip_address,
-                "timestamp": activity.timestamp,
-                "metadata": activity.metadata
-            }
-            for activity in activities
-        ]
+        return [dict(activity._mapping) for activity in activities]
     
     # System Health & Monitoring
     def get_system_health(self, db: Session) -> Dict[str, Any]:
@@ -116,17 +205,10 @@ class AdminService:
             self.logger.error(f"Database health check failed: {e}")
         
         # System resources
-        cpu_percent = psutil.cpu_percent(interval=1)
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
+        cpu_percent, memory, disk = self.get_system_resources()
         
-        # Recent alerts
-        recent_alerts = db.query(SystemAlerts).filter(
-            and_(
-                SystemAlerts.created_at >= datetime.utcnow() - timedelta(hours=24),
-                SystemAlerts.is_resolved == False
-            )
-        ).count()
+        # Recent alerts: unresolved count and severity distribution in one pass
+        recent_alerts, severity_distribution = self.get_alert_summary(db)
         
         # API performance (last 24 hours)
         api_metrics = self.get_api_performance_summary(db)
@@ -145,7 +227,7 @@ class AdminService:
             },
             "alerts": {
                 "unresolved_count": recent_alerts,
-                "severity_distribution": self.get_alert_severity_distribution(db)
+                "severity_distribution": severity_distribution
             },
             "api_performance": api_metrics
         }
@@ -185,37 +267,40 @@ class AdminService:
         
         return summary
     
-    def get_alert_severity_distribution(self, db: Session) -> Dict[str, int]:
-        """Get distribution of alert severities"""
+    def get_alert_summary(self, db: Session) -> Tuple[int, Dict[str, int]]:
+        """Unresolved alert count and severity distribution for the last 24 hours"""
         yesterday = datetime.utcnow() - timedelta(days=1)
         
         alerts = db.query(
             SystemAlerts.severity,
-            func.count(SystemAlerts.id).label('count')
+            func.count(SystemAlerts.id).label('count'),
+            func.count(SystemAlerts.id).filter(SystemAlerts.is_resolved == False).label('unresolved')
         ).filter(
             SystemAlerts.created_at >= yesterday
         ).group_by(SystemAlerts.severity).all()
         
-        return {alert.severity: alert.count for alert in alerts}
+        unresolved_count = sum(alert.unresolved for alert in alerts)
+        return unresolved_count, {alert.severity: alert.count for alert in alerts}
+    
+    def get_alert_severity_distribution(self, db: Session) -> Dict[str, int]:
+        """Get distribution of alert severities"""
+        return self.get_alert_summary(db)[1]
     
     # Trading Platform Oversight
     def get_platform_metrics(self, db: Session) -> Dict[str, Any]:
         """Get platform-wide trading metrics"""
-        # Total trades
-        total_trades = db.query(Trade).count()
-        
-        # Trades in last 24 hours
         yesterday = datetime.utcnow() - timedelta(days=1)
-        daily_trades = db.query(Trade).filter(Trade.timestamp >= yesterday).count()
-        
-        # Open vs closed trades
-        open_trades = db.query(Trade).filter(Trade.status == 'OPEN').count()
-        closed_trades = db.query(Trade).filter(Trade.status == 'CLOSED').count()
         
-        # Total portfolio value across all users
-        total_portfolio_value = db.query(func.sum(Trade.total_value)).filter(
-            Trade.status == 'OPEN'
-        ).scalar() or 0
+        # Trade totals (all, last 24 hours, open vs closed) and total portfolio
+        # value across all users in a single scan
+        total_trades, daily_trades, open_trades, closed_trades, total_portfolio_value = db.query(
+            func.count(Trade.id),
+            func.count(Trade.id).filter(Trade.timestamp >= yesterday),
+            func.count(Trade.id).filter(Trade.status == 'OPEN'),
+            func.count(Trade.id).filter(Trade.status == 'CLOSED'),
+            func.sum(Trade.total_value).filter(Trade.status == 'OPEN')
+        ).one()
+        total_portfolio_value = total_portfolio_value or 0
         
         # Most traded symbols
         top_symbols = db.query(
@@ -225,10 +310,10 @@ class AdminService:
         ).group_by(Trade.symbol).order_by(desc('trade_count')).limit(10).all()
         
         # Sentiment analysis stats
-        sentiment_count = db.query(SentimentData).count()
-        recent_sentiment = db.query(SentimentData).filter(
-            SentimentData.timestamp >= yesterday
-        ).count()
+        sentiment_count, recent_sentiment = db.query(
+            func.count(SentimentData.id),
+            func.count(SentimentData.id).filter(SentimentData.timestamp >= yesterday)
+        ).one()
         
         return {
             "trades": {
@@ -285,6 +370,9 @@ class AdminService:
         db.commit()
         db.refresh(flag)
         
+        # Admin writes invalidate cached dashboard numbers
+        self._cache.clear()
+        
         return {"message": "Feature flag updated successfully"}
     
     def get_system_config(self, db: Session, category: Optional[str] = None) -> List[Dict[str, Any]]:
@@ -324,14 +412,69 @@ class AdminService:
         db.commit()
         db.refresh(export)
         
-        # TODO: Implement async export processing
-        # For now, return the export request
+        # Files are produced by process_data_export, run in the background by the API
         return {
             "export_id": export.id,
             "status": export.status,
             "message": "Export request created successfully"
         }
     
+    def process_data_export(self, export_id: int):
+        """Stream an export request to a gzipped CSV file in fixed-size chunks.
+        
+        Rows are fetched as plain tuples with yield_per so memory stays bounded
+        by EXPORT_BATCH_SIZE regardless of table size. Uses its own session so it
+        can run after the request that created the export has finished.
+        """
+        db = SessionLocal()
+        export = None
+        try:
+            export = db.query(DataExports).filter(DataExports.id == export_id).first()
+            if not export:
+                self.logger.error(f"Data export {export_id} not found")
+                return
+            
+            columns, time_column = EXPORT_SOURCES[export.export_type]
+            filters = export.filters or {}
+            
+            stmt = select(*columns).order_by(columns[0])
+            if filters.get("start_date"):
+                stmt = stmt.where(time_column >= datetime.fromisoformat(filters["start_date"]))
+            if filters.get("end_date"):
+                stmt = stmt.where(time_column <= datetime.fromisoformat(filters["end_date"]))
+            
+            export.status = "processing"
+            db.commit()
+            
+            EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+            file_path = EXPORT_DIR / f"{export.export_type}_{export.id}.csv.gz"
+            
+            record_count = 0
+            with gzip.open(file_path, "wt", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow([column.key for column in columns])
+                result = db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+                for rows in result.partitions():
+                    writer.writerows(rows)
+                    record_count += len(rows)
+            
+            export.status = "completed"
+            export.file_path = str(file_path)
+            export.file_size = file_path.stat().st_size
+            export.record_count = record_count
+            export.completed_at = datetime.utcnow()
+            db.commit()
+        
+        except Exception as e:
+            self.logger.error(f"Data export {export_id} failed: {e}")
+            db.rollback()
+            if export is not None:
+                export.status = "failed"
+                export.error_message = str(e)
+                db.commit()
+        finally:
+            db.close()
+    
     def get_data_exports(self, db: Session) -> List[Dict[str, Any]]:
         """Get all data export requests"""
         exports = db.query(DataExports).order_by(desc(DataExports.requested_at)).all()
@@ -353,15 +496,28 @@ class AdminService:
     # Analytics
     def get_usage_analytics(self, db: Session, days: int = 30) -> Dict[str, Any]:
         """Get platform usage analytics"""
-        start_date = datetime.utcnow() - timedelta(days=days)
+        now = datetime.utcnow()
+        start_date = now - timedelta(days=days)
+        
+        # Daily active users, bucketed with the dialect's native day truncation
+        if db.get_bind().dialect.name == "postgresql":
+            day = cast(func.date_trunc('day', UserActivity.timestamp), Date)
+        else:
+            day = func.date(UserActivity.timestamp)
+        daily_counts = {
+            str(row.date): row.active_users
+            for row in db.query(
+                day.label('date'),
+                func.count(func.distinct(UserActivity.user_id)).label('active_users')
+            ).filter(
+                UserActivity.timestamp >= start_date
+            ).group_by(day).all()
+        }
         
-        # Daily active users
-        daily_users = db.query(
-            func.date(UserActivity.timestamp).label('date'),
-            func.count(func.distinct(UserActivity.user_id)).label('active_users')
-        ).filter(
-            UserActivity.timestamp >= start_date
-        ).group_by(func.date(UserActivity.timestamp)).all()
+        # Report every day in the window, including days with no activity
+        first_day = start_date.date()
+        all_days = [str(first_day + timedelta(days=i))
+                    for i in range((now.date() - first_day).days + 1)]
         
         # Feature usage
         feature_usage = db.query(
@@ -381,8 +537,8 @@ class AdminService:
         
         return {
             "daily_active_users": [
-                {"date": str(day.date), "active_users": day.active_users}
-                for day in daily_users
+                {"date": date, "active_users": daily_counts.get(date, 0)}
+                for date in all_days
             ],
             "feature_usage": [
                 {"action": usage.action, "count": usage.usage_count}
@@ -2,14 +2,72 @@
 Alternative news sentiment service that doesn't require API keys.
 Uses web scraping and free RSS feeds for news data.
 """
+import io
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Dict, List, NamedTuple, Optional
 import xml.etree.ElementTree as ET
-from urllib.parse import quote
+from urllib.parse import quote, urlparse
 import time
 
+FEED_TIMEOUT = (3.05, 10)  # (connect, read) seconds per feed request
+FEED_CACHE_TTL = 60  # seconds a fetched feed's items are reused before refetching
+FEED_SCAN_LIMIT = 5  # items per feed scanned for symbol mentions
+FEED_SCAN_LIMITS = {'yahoo_finance': 10}  # per-source overrides of FEED_SCAN_LIMIT
+
+
+class FeedItem(NamedTuple):
+    """Text of one RSS <item>, as kept in the feed cache."""
+    title: str
+    description: str
+    pub_date: Optional[str]
+    link: str
+    search_text: str  # "title description", upper-cased once for symbol checks
+
+
+def _build_feed_session() -> requests.Session:
+    """HTTP session for feed requests: pooled keep-alive connections, gzip, and
+    transient server errors retried with backoff (rate limiting, 429, is not)."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=3, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504),
+            raise_on_status=False,  # Hand back the last response so Retry-After can be read
+            # Don't sleep out Retry-After inside the request (it can be hours);
+            # _note_retry_after pauses the host instead
+            respect_retry_after_header=False
+        )
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
+        'Accept-Encoding': 'gzip, deflate'
+    })
+    return session
+
+
+# One session for every AlternativeNewsService in the process, built at import so
+# connections to each feed host are kept alive across services and requests
+_feed_session = _build_feed_session()
+
+# Hosts that asked us to back off, shared so every service honours a Retry-After:
+# host -> monotonic time before which we don't call them
+_host_backoff: Dict[str, float] = {}
+_host_backoff_lock = threading.Lock()
+
+# Parsed feed items by URL, shared so every service reuses a fetch within
+# FEED_CACHE_TTL: url -> (monotonic fetch time, items)
+_feed_cache: Dict[str, tuple] = {}
+_feed_cache_lock = threading.Lock()
+
 class AlternativeNewsService:
     def __init__(self):
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
@@ -30,11 +88,7 @@ class AlternativeNewsService:
         articles = self._search_google_finance(symbol)
         all_articles.extend(articles)
         
-        # Method 2: Yahoo Finance RSS (free)
-        articles = self._get_yahoo_finance_news(symbol)
-        all_articles.extend(articles)
-        
-        # Method 3: Search general financial RSS feeds
+        # Method 2: Search Yahoo Finance and general financial RSS feeds in one pass
         articles = self._search_rss_feeds(symbol)
         all_articles.extend(articles)
         
@@ -70,78 +124,111 @@ class AlternativeNewsService:
             self.logger.error(f"Error searching Google Finance for {symbol}: {str(e)}")
             return []
     
-    def _get_yahoo_finance_news(self, symbol: str) -> List[Dict]:
-        """Get news from Yahoo Finance RSS feeds."""
+    def _fetch_feed(self, source_name: str, feed_url: str) -> Optional[List[FeedItem]]:
+        """Items of one RSS feed, reused for FEED_CACHE_TTL seconds; None if it is unavailable."""
+        with _feed_cache_lock:
+            cached = _feed_cache.get(feed_url)
+        if cached is not None and time.monotonic() - cached[0] < FEED_CACHE_TTL:
+            return cached[1]
+        
+        # Only throttle hosts that have told us to; serve their last items meanwhile
+        host = urlparse(feed_url).netloc
+        with _host_backoff_lock:
+            paused_until = _host_backoff.get(host, 0)
+        if time.monotonic() < paused_until:
+            return cached[1] if cached is not None else None
+        
         try:
-            # Yahoo Finance doesn't have symbol-specific RSS, but we can get general market news
-            url = "https://feeds.finance.yahoo.com/rss/2.0/headline"
-            
-            response = requests.get(url, timeout=10)
+            response = _feed_session.get(feed_url, timeout=FEED_TIMEOUT)
             if response.status_code != 200:
-                return []
-            
-            # Parse RSS feed
-            root = ET.fromstring(response.content)
-            articles = []
-            
-            for item in root.findall('.//item')[:10]:  # Get first 10 items
-                title = item.find('title')
-                description = item.find('description')
-                pub_date = item.find('pubDate')
-                link = item.find('link')
-                
-                # Only include if symbol is mentioned in title or description
-                title_text = title.text if title is not None else ''
-                desc_text = description.text if description is not None else ''
-                
-                if symbol.upper() in (title_text + ' ' + desc_text).upper():
-                    articles.append({
-                        'title': title_text,
-                        'description': desc_text,
-                        'publishedAt': pub_date.text if pub_date is not None else datetime.now().isoformat(),
-                        'source': {'name': 'Yahoo Finance'},
-                        'url': link.text if link is not None else ''
-                    })
-            
-            return articles
-            
+                self._note_retry_after(host, response)
+                return None
+            items = self._parse_rss_items(response.content)
         except Exception as e:
-            self.logger.error(f"Error getting Yahoo Finance news: {str(e)}")
-            return []
+            self.logger.error(f"Error fetching {source_name} feed: {str(e)}")
+            return None
+        
+        with _feed_cache_lock:
+            _feed_cache[feed_url] = (time.monotonic(), items)
+        return items
+    
+    def _note_retry_after(self, host: str, response: requests.Response):
+        """Back off from a host for as long as its Retry-After header asks."""
+        retry_after = response.headers.get('Retry-After')
+        if not retry_after:
+            return
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            delay = FEED_CACHE_TTL  # HTTP-date form; wait one cache window
+        with _host_backoff_lock:
+            _host_backoff[host] = time.monotonic() + delay
+        self.logger.warning(f"{host} asked to retry after {retry_after}; pausing its feed")
+    
+    def _parse_rss_items(self, content: bytes) -> List[FeedItem]:
+        """Extract title/description/pubDate/link text from every <item> in an RSS document.
+        
+        Streams the document with iterparse and clears each item once read, so
+        the full tree is never kept in memory.
+        """
+        items = []
+        
+        for _, element in ET.iterparse(io.BytesIO(content), events=("end",)):
+            if element.tag != 'item':
+                continue
+            title = element.findtext('title') or ''
+            description = element.findtext('description') or ''
+            items.append(FeedItem(
+                title=title,
+                description=description,
+                pub_date=element.findtext('pubDate') or None,
+                link=element.findtext('link') or '',
+                # Upper-cased once here so symbol checks on cached items allocate nothing
+                search_text=f"{title} {description}".upper()
+            ))
+            element.clear()
+        
+        return items
+    
+    def _to_article(self, item: FeedItem, source_name: str) -> Dict:
+        """Article dict in the NewsAPI-like shape used by the sentiment service."""
+        return {
+            'title': item.title,
+            'description': item.description,
+            'publishedAt': item.pub_date or datetime.now().isoformat(),
+            'source': {'name': source_name},
+            'url': item.link
+        }
+    
+    def _fetch_all_feeds(self) -> Dict[str, List[FeedItem]]:
+        """Items of every configured feed, fetched concurrently, keyed by source name.
+        
+        Each feed is a different host, so requests go out in parallel and the
+        total wait is the slowest feed rather than the sum of all of them.
+        """
+        with ThreadPoolExecutor(max_workers=len(self.news_sources)) as executor:
+            feeds = executor.map(lambda source: self._fetch_feed(*source), self.news_sources.items())
+            return {
+                source_name: items
+                for source_name, items in zip(self.news_sources, feeds)
+                if items is not None
+            }
     
     def _search_rss_feeds(self, symbol: str) -> List[Dict]:
-        """Search RSS feeds for symbol mentions."""
+        """Search RSS feeds for symbol mentions.
+        
+        Each feed is fetched and scanned once; Yahoo Finance, which has no
+        symbol-specific RSS, gets a deeper scan of its general headlines.
+        """
         articles = []
+        symbol_upper = symbol.upper()
         
-        for source_name, feed_url in self.news_sources.items():
+        for source_name, items in self._fetch_all_feeds().items():
             try:
-                response = requests.get(feed_url, timeout=10)
-                if response.status_code != 200:
-                    continue
-                
-                root = ET.fromstring(response.content)
-                
-                for item in root.findall('.//item')[:5]:  # Limit per feed
-                    title = item.find('title')
-                    description = item.find('description')
-                    
-                    title_text = title.text if title is not None else ''
-                    desc_text = description.text if description is not None else ''
-                    
+                for item in items[:FEED_SCAN_LIMITS.get(source_name, FEED_SCAN_LIMIT)]:
                     # Check if symbol is mentioned
-                    if symbol.upper() in (title_text + ' ' + desc_text).upper():
-                        pub_date = item.find('pubDate')
-                        link = item.find('link')
-                        
-                        articles.append({
-                            'title': title_text,
-                            'description': desc_text,
-                            'publishedAt': pub_date.text if pub_date is not None else datetime.now().isoformat(),
-                            'source': {'name': source_name.replace('_', ' ').title()},
-                            'url': link.text if link is not None else ''
-                        })
-                
-                time.sleep(0.5)  # Rate limiting
+                    if symbol_upper in item.search_text:
+                        articles.append(self._to_article(item, source_name.replace('_', ' ').title()))
                 
             except Exception as e:
                 self.logger.error(f"Error searching {source_name} for {symbol}: {str(e)}")
@@ -155,7 +242,8 @@ class AlternativeNewsService:
         seen_titles = set()
         
         for article in articles:
-            title = article.get('title', '').lower().strip()
+            # Collapse whitespace runs so spacing differences don't defeat deduplication
+            title = ' '.join(article.get('title', '').lower().split())
             if title and title not in seen_titles:
                 seen_titles.add(title)
                 unique_articles.append(article)
@@ -166,29 +254,10 @@ class AlternativeNewsService:
         """Get general market news from RSS feeds."""
         all_articles = []
         
-        for source_name, feed_url in self.news_sources.items():
+        for source_name, items in self._fetch_all_feeds().items():
             try:
-                response = requests.get(feed_url, timeout=10)
-                if response.status_code != 200:
-                    continue
-                
-                root = ET.fromstring(response.content)
-                
-                for item in root.findall('.//item')[:10]:
-                    title = item.find('title')
-                    description = item.find('description')
-                    pub_date = item.find('pubDate')
-                    link = item.find('link')
-                    
-                    all_articles.append({
-                        'title': title.text if title is not None else '',
-                        'description': description.text if description is not None else '',
-                        'publishedAt': pub_date.text if pub_date is not None else datetime.now().isoformat(),
-                        'source': {'name': source_name.replace('_', ' ').title()},
-                        'url': link.text if link is not None else ''
-                    })
-                
-                time.sleep(0.5)  # Rate limiting
+                for item in items[:10]:
+                    all_articles.append(self._to_article(item, source_name.replace('_', ' ').title()))
                 
             except Exception as e:
                 self.logger.error(f"Error getting news from {source_name}: {str(e)}")
@@ -7,8 +7,8 @@ import logging
 import asyncio
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import and_, or_, func, case
 
 from database import get_db
 from models import WatchlistStock, WatchlistAlert, SentimentData, Trade
@@ -36,8 +36,10 @@ class ContinuousMonitoringService:
         try:
             self.logger.info("Starting continuous monitoring cycle...")
             
-            # Get all active watchlist stocks
-            active_stocks = db.query(WatchlistStock).filter(
+            # Get all active watchlist stocks, with their alerts loaded in one extra query
+            active_stocks = db.query(WatchlistStock).options(
+                selectinload(WatchlistStock.alerts)
+            ).filter(
                 WatchlistStock.is_active == True
             ).all()
             
@@ -53,10 +55,21 @@ class ContinuousMonitoringService:
                 "errors": []
             }
             
+            # Everything the per-stock checks read, gathered once for the whole cycle:
+            # quotes (fetched concurrently, off the event loop), latest sentiment and
+            # open positions (one query each), and a snapshot of the available balance
+            symbols = [stock.symbol for stock in active_stocks]
+            cycle = {
+                "market_data": await self._fetch_market_data(db, active_stocks),
+                "sentiment": self._get_latest_sentiments(db, symbols),
+                "open_positions": self._get_open_positions(db, symbols),
+                "balance": self.trading_service.current_balance
+            }
+            
             # Process each stock
             for stock in active_stocks:
                 try:
-                    result = await self._monitor_stock(db, stock)
+                    result = await self._monitor_stock(db, stock, cycle)
                     
                     if result.get("sentiment_updated"):
                         monitoring_results["sentiment_updates"] += 1
@@ -72,6 +85,9 @@ class ContinuousMonitoringService:
                     monitoring_results["errors"].append(error_msg)
                     self.logger.error(error_msg)
             
+            # Persist monitoring timestamps, reference prices and alert triggers in one transaction
+            await asyncio.to_thread(db.commit)
+            
             self.logger.info(
                 f"Continuous monitoring completed: {monitoring_results['monitored_count']} stocks, "
                 f"{monitoring_results['sentiment_updates']} sentiment updates, "
@@ -85,8 +101,75 @@ class ContinuousMonitoringService:
             self.logger.error(f"Error in continuous monitoring: {str(e)}")
             return {"error": str(e)}
     
-    async def _monitor_stock(self, db: Session, stock: WatchlistStock) -> Dict:
-        """Monitor a single stock for sentiment changes, price alerts, and trading signals."""
+    async def _fetch_market_data(self, db: Session, stocks: List[WatchlistStock]) -> Dict[str, Dict]:
+        """Fetch current market data for each distinct symbol, keyed by symbol.
+        
+        Quote lookups are blocking network calls, so they run in worker threads,
+        at most MONITOR_CONCURRENCY at a time; DataService's token bucket still
+        bounds the underlying API call rate. The session is only used afterwards, on
+        this thread, to fall back to recently stored prices for failed lookups.
+        """
+        semaphore = asyncio.Semaphore(config.MONITOR_CONCURRENCY or 8)
+        
+        async def fetch(symbol: str) -> Dict:
+            async with semaphore:
+                return await asyncio.to_thread(self.data_service.get_market_data, symbol, 1)
+        
+        symbols = list(dict.fromkeys(stock.symbol for stock in stocks))
+        results = await asyncio.gather(*(fetch(symbol) for symbol in symbols), return_exceptions=True)
+        
+        market_data_by_symbol = {}
+        for symbol, market_data in zip(symbols, results):
+            if isinstance(market_data, Exception):
+                market_data = {"error": f"Failed to retrieve market data for {symbol}: {str(market_data)}"}
+            if "error" in market_data:
+                market_data = self.data_service.get_cached_market_data(db, symbol) or market_data
+            market_data_by_symbol[symbol] = market_data
+        
+        return market_data_by_symbol
+    
+    def _get_latest_sentiments(self, db: Session, symbols: List[str]) -> Dict:
+        """Most recent (symbol, overall_sentiment, timestamp) row per symbol, keyed by symbol."""
+        if not symbols:
+            return {}
+        
+        ranked = db.query(
+            SentimentData.symbol,
+            SentimentData.overall_sentiment,
+            SentimentData.timestamp,
+            func.row_number().over(
+                partition_by=SentimentData.symbol,
+                order_by=SentimentData.timestamp.desc()
+            ).label("rank")
+        ).filter(SentimentData.symbol.in_(set(symbols))).subquery()
+        
+        latest = db.query(ranked.c.symbol, ranked.c.overall_sentiment, ranked.c.timestamp).filter(
+            ranked.c.rank == 1
+        ).all()
+        return {row.symbol: row for row in latest}
+    
+    def _get_open_positions(self, db: Session, symbols: List[str]) -> Dict[str, Tuple[int, float]]:
+        """(open trade count, total open BUY quantity) per symbol, for symbols with open trades."""
+        if not symbols:
+            return {}
+        
+        positions = db.query(
+            Trade.symbol,
+            func.count(Trade.id),
+            func.coalesce(func.sum(case((Trade.trade_type == "BUY", Trade.quantity), else_=0)), 0)
+        ).filter(
+            and_(
+                Trade.symbol.in_(set(symbols)),
+                Trade.status == "OPEN"
+            )
+        ).group_by(Trade.symbol).all()
+        return {symbol: (open_count, buy_quantity) for symbol, open_count, buy_quantity in positions}
+    
+    async def _monitor_stock(self, db: Session, stock: WatchlistStock, cycle: Dict) -> Dict:
+        """Monitor a single stock for sentiment changes, price alerts, and trading signals.
+        
+        cycle holds the data prefetched by run_continuous_monitoring for all stocks.
+        """
         result = {
             "sentiment_updated": False,
             "alerts_generated": 0,
@@ -94,13 +177,14 @@ class ContinuousMonitoringService:
         }
         
         try:
+            sentiment_by_symbol = cycle["sentiment"]
+            market_data = cycle["market_data"][stock.symbol]
+            
             # Check if sentiment analysis is needed
-            if stock.sentiment_monitoring and self._should_update_sentiment(db, stock.symbol):
+            if stock.sentiment_monitoring and self._should_update_sentiment(sentiment_by_symbol.get(stock.symbol)):
                 await self._update_stock_sentiment(db, stock.symbol)
                 result["sentiment_updated"] = True
-            
-            # Get current market data
-            market_data = self.data_service.get_market_data(stock.symbol, days=1, db=db)
+                sentiment_by_symbol.update(self._get_latest_sentiments(db, [stock.symbol]))
             
             if "error" not in market_data:
                 current_price = market_data["current_price"]
@@ -111,12 +195,14 @@ class ContinuousMonitoringService:
                 
                 # Generate trading signals if auto-trading is enabled
                 if stock.auto_trading:
-                    trading_signal = await self._generate_trading_signal(db, stock, current_price)
+                    trading_signal = await self._generate_trading_signal(
+                        db, stock, current_price, sentiment_by_symbol.get(stock.symbol),
+                        cycle["open_positions"].get(stock.symbol, (0, 0)), cycle["balance"]
+                    )
                     result["trading_signal"] = trading_signal
             
-            # Update last monitoring timestamp
+            # Update last monitoring timestamp (committed with the rest of the cycle)
             stock.last_monitored = datetime.now()
-            db.commit()
             
         except Exception as e:
             self.logger.error(f"Error monitoring stock {stock.symbol}: {str(e)}")
@@ -124,13 +210,9 @@ class ContinuousMonitoringService:
         
         return result
     
-    def _should_update_sentiment(self, db: Session, symbol: str) -> bool:
-        """Check if sentiment data needs to be updated for a symbol."""
+    def _should_update_sentiment(self, latest_sentiment) -> bool:
+        """Check if sentiment data needs to be updated, given the symbol's latest sentiment row."""
         try:
-            latest_sentiment = db.query(SentimentData).filter(
-                SentimentData.symbol == symbol
-            ).order_by(SentimentData.timestamp.desc()).first()
-            
             if not latest_sentiment:
                 return True
             
@@ -139,7 +221,7 @@ class ContinuousMonitoringService:
             return time_since_update.total_seconds() > (self.sentiment_refresh_interval * 60)
             
         except Exception as e:
-            self.logger.error(f"Error checking sentiment update need for {symbol}: {str(e)}")
+            self.logger.error(f"Error checking sentiment update need for {latest_sentiment.symbol}: {str(e)}")
             return False
     
     async def _update_stock_sentiment(self, db: Session, symbol: str):
@@ -147,8 +229,13 @@ class ContinuousMonitoringService:
         try:
             self.logger.info(f"Updating sentiment for {symbol}")
             
-            # Run sentiment analysis
-            result = self.sentiment_service.analyze_sentiment(db, symbol)
+            # analyze_sentiment rolls the session back on failure; commit the cycle's
+            # pending monitoring updates first so a failed refresh can't discard them
+            await asyncio.to_thread(db.commit)
+            
+            # Run sentiment analysis (news fetches, scoring and its commit) in a worker
+            # thread; this coroutine waits for it, so the session is never used concurrently
+            result = await asyncio.to_thread(self.sentiment_service.analyze_sentiment, db, symbol)
             
             if "error" not in result:
                 self.logger.info(f"Sentiment updated for {symbol}: {result.get('overall_sentiment', 'N/A')}")
@@ -163,12 +250,7 @@ class ContinuousMonitoringService:
         alerts_generated = 0
         
         try:
-            # Get existing alerts for this stock
-            existing_alerts = db.query(WatchlistAlert).filter(
-                WatchlistAlert.watchlist_stock_id == stock.id
-            ).all()
-            
-            for alert in existing_alerts:
+            for alert in stock.alerts:
                 if not alert.is_active:
                     continue
                 
@@ -193,7 +275,6 @@ class ContinuousMonitoringService:
             # Update reference price for percentage change calculations
             if not stock.reference_price or self._should_update_reference_price(stock):
                 stock.reference_price = current_price
-                db.commit()
                 
         except Exception as e:
             self.logger.error(f"Error checking price alerts for {stock.symbol}: {str(e)}")
@@ -222,8 +303,6 @@ class ContinuousMonitoringService:
             
             # Could extend this to send notifications, emails, etc.
             
-            db.commit()
-            
         except Exception as e:
             self.logger.error(f"Error triggering alert for {stock.symbol}: {str(e)}")
     
@@ -236,42 +315,30 @@ class ContinuousMonitoringService:
         time_since_update = datetime.now() - stock.reference_price_updated
         return time_since_update.days >= 1
     
-    async def _generate_trading_signal(self, db: Session, stock: WatchlistStock, current_price: float) -> Optional[Dict]:
+    async def _generate_trading_signal(self, db: Session, stock: WatchlistStock, current_price: float,
+                                       latest_sentiment, open_position: Tuple[int, float],
+                                       available_balance: float) -> Optional[Dict]:
         """Generate trading signals based on sentiment and price analysis."""
         try:
             if not stock.auto_trading:
                 return None
             
-            # Get latest sentiment data
-            latest_sentiment = db.query(SentimentData).filter(
-                SentimentData.symbol == stock.symbol
-            ).order_by(SentimentData.timestamp.desc()).first()
-            
             if not latest_sentiment:
                 return None
             
             sentiment_score = latest_sentiment.overall_sentiment
             
             # Check if we already have an open position
-            open_trades = db.query(Trade).filter(
-                and_(
-                    Trade.symbol == stock.symbol,
-                    Trade.status == "OPEN"
-                )
-            ).all()
-            
-            has_open_position = len(open_trades) > 0
+            open_trade_count, total_position = open_position
+            has_open_position = open_trade_count > 0
             
             # Generate signal based on sentiment and configuration
             signal = None
             
             # Buy signal conditions
-            if (sentiment_score > config.BUY_SENTIMENT_THRESHOLD and 
-                not has_open_position and 
-                self._meets_buy_conditions(stock, current_price)):
-                
-                position_size = self._calculate_position_size(stock, current_price)
-                if position_size > 0:
+            if sentiment_score > config.BUY_SENTIMENT_THRESHOLD and not has_open_position:
+                position_size = self._calculate_position_size(stock, current_price, available_balance)
+                if position_size > 0 and self._meets_buy_conditions(stock, current_price, position_size):
                     signal = {
                         "action": "BUY",
                         "symbol": stock.symbol,
@@ -287,7 +354,6 @@ class ContinuousMonitoringService:
                   has_open_position and 
                   self._meets_sell_conditions(stock, current_price)):
                 
-                total_position = sum(trade.quantity for trade in open_trades if trade.trade_type == "BUY")
                 if total_position > 0:
                     signal = {
                         "action": "SELL",
@@ -308,11 +374,11 @@ class ContinuousMonitoringService:
             self.logger.error(f"Error generating trading signal for {stock.symbol}: {str(e)}")
             return None
     
-    def _meets_buy_conditions(self, stock: WatchlistStock, current_price: float) -> bool:
+    def _meets_buy_conditions(self, stock: WatchlistStock, current_price: float, position_size: int) -> bool:
         """Check if buy conditions are met based on stock preferences."""
         # Check maximum position size
         if stock.max_position_size:
-            position_value = self._calculate_position_size(stock, current_price) * current_price
+            position_value = position_size * current_price
             if position_value > stock.max_position_size:
                 return False
         
@@ -328,12 +394,10 @@ class ContinuousMonitoringService:
         # Add sophisticated sell conditions
         return True  # Simplified for now
     
-    def _calculate_position_size(self, stock: WatchlistStock, current_price: float) -> int:
+    def _calculate_position_size(self, stock: WatchlistStock, current_price: float,
+                                 available_balance: float) -> int:
         """Calculate appropriate position size based on stock preferences and available capital."""
         try:
-            # Get current available balance
-            available_balance = self.trading_service.current_balance
-            
             # Determine position size based on preferences
             max_position_value = stock.max_position_size or (available_balance * config.MAX_POSITION_SIZE)
             
@@ -352,23 +416,33 @@ class ContinuousMonitoringService:
     def get_monitoring_status(self, db: Session) -> Dict:
         """Get current monitoring status for all watchlist stocks."""
         try:
-            active_stocks = db.query(WatchlistStock).filter(
+            # Only the columns the status report shows
+            active_stocks = db.query(
+                WatchlistStock.symbol,
+                WatchlistStock.company_name,
+                WatchlistStock.is_active,
+                WatchlistStock.sentiment_monitoring,
+                WatchlistStock.auto_trading,
+                WatchlistStock.last_monitored
+            ).filter(
                 WatchlistStock.is_active == True
             ).all()
             
             status = {
                 "total_active_stocks": len(active_stocks),
-                "sentiment_monitoring_enabled": len([s for s in active_stocks if s.sentiment_monitoring]),
-                "auto_trading_enabled": len([s for s in active_stocks if s.auto_trading]),
+                "sentiment_monitoring_enabled": 0,
+                "auto_trading_enabled": 0,
                 "last_monitoring_cycle": None,
                 "stocks": []
             }
             
+            sentiment_by_symbol = self._get_latest_sentiments(db, [stock.symbol for stock in active_stocks])
+            now = datetime.now()
+            latest_monitored = None
+            
+            # Per-stock entries, flag counts and most recent monitoring time in one pass
             for stock in active_stocks:
-                # Get latest sentiment
-                latest_sentiment = db.query(SentimentData).filter(
-                    SentimentData.symbol == stock.symbol
-                ).order_by(SentimentData.timestamp.desc()).first()
+                latest_sentiment = sentiment_by_symbol.get(stock.symbol)
                 
                 stock_status = {
                     "symbol": stock.symbol,
@@ -382,16 +456,20 @@ class ContinuousMonitoringService:
                 }
                 
                 if latest_sentiment:
-                    age = datetime.now() - latest_sentiment.timestamp
+                    age = now - latest_sentiment.timestamp
                     stock_status["sentiment_age_minutes"] = int(age.total_seconds() / 60)
                 
+                if stock.sentiment_monitoring:
+                    status["sentiment_monitoring_enabled"] += 1
+                if stock.auto_trading:
+                    status["auto_trading_enabled"] += 1
+                if stock.last_monitored and (latest_monitored is None or stock.last_monitored > latest_monitored):
+                    latest_monitored = stock.last_monitored
+                
                 status["stocks"].append(stock_status)
             
-            # Find most recent monitoring time
-            if active_stocks:
-                latest_monitored = max([s.last_monitored for s in active_stocks if s.last_monitored], default=None)
-                if latest_monitored:
-                    status["last_monitoring_cycle"] = latest_monitored.isoformat()
+            if latest_monitored:
+                status["last_monitoring_cycle"] = latest_monitored.isoformat()
             
             return status
             
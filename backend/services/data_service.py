@@ -1,25 +1,79 @@
 import yfinance as yf
 import pandas as pd
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import desc, func
 from datetime import datetime, timedelta
+from itertools import groupby
 from typing import Dict, List, Optional
 import time
 import random
 import logging
+import threading
+import json
+import os
+import tempfile
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 from models import StockData
-from schemas import StockDataResponse
+from schemas import StockDataResponse, StockDataResponseList
 from config import config
 from exceptions import StockDataError, APIRateLimitError
 
+MARKET_DATA_CACHE_TTL = 60  # seconds a live quote is reused before Yahoo Finance is asked again
+MARKET_DATA_CACHE_SIZE = 1024  # entries kept before expired quotes are swept
+COMPANY_INFO_CACHE_TTL = 24 * 3600  # seconds company details (name, sector, ratios) are reused
+COMPANY_INFO_CACHE_FILE = Path(os.getenv("COMPANY_INFO_CACHE_FILE", ".cache/company_info.json"))
+COMPANY_INFO_FIELDS = ('longName', 'sector', 'industry', 'marketCap', 'trailingPE', 'dividendYield')
+
+# Live market data shared by every DataService in the process (monitoring, API,
+# scheduler): (symbol, days) -> (monotonic fetch time, data)
+_quote_cache: Dict[tuple, tuple] = {}
+_quote_cache_lock = threading.Lock()
+
+# Yahoo Finance token bucket shared by every DataService in the process: refills at
+# YF_REQUESTS_PER_SECOND and holds up to YF_MAX_CONCURRENCY tokens, so a burst of
+# concurrent fetches can start together while the sustained rate stays bounded
+_yahoo_bucket = {"tokens": None, "updated": 0.0}
+_yahoo_bucket_lock = threading.Lock()
+
+# Company details by symbol, shared by every DataService and persisted to
+# COMPANY_INFO_CACHE_FILE: symbol -> [epoch fetch time, fields]; loaded on first use
+_company_info_cache = {"entries": None}
+_company_info_lock = threading.Lock()
+
 class DataService:
     def __init__(self):
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
-        self.last_api_call = 0  # For rate limiting
     
     def get_market_data(self, symbol: str, days: int = 30, db: Session = None) -> Dict:
-        """Get market data for a stock symbol with proper caching fallback"""
+        """Get market data for a stock symbol with proper caching fallback.
+        
+        Live results are reused for MARKET_DATA_CACHE_TTL seconds, so repeated
+        dashboard refreshes and monitoring cycles don't each hit Yahoo Finance.
+        """
+        key = (symbol, days)
+        with _quote_cache_lock:
+            cached = _quote_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < MARKET_DATA_CACHE_TTL:
+            return dict(cached[1])
+        
+        market_data = self._fetch_market_data(symbol, db)
+        
+        # Only cache live quotes; errors and database fallbacks are retried next call
+        if "error" not in market_data and not market_data.get("data_source", "").startswith("cached"):
+            now = time.monotonic()
+            with _quote_cache_lock:
+                if len(_quote_cache) >= MARKET_DATA_CACHE_SIZE:
+                    for expired in [k for k, v in _quote_cache.items() if now - v[0] >= MARKET_DATA_CACHE_TTL]:
+                        del _quote_cache[expired]
+                _quote_cache[key] = (now, market_data)
+            return dict(market_data)
+        
+        return market_data
+    
+    def _fetch_market_data(self, symbol: str, db: Session = None) -> Dict:
+        """Fetch market data from Yahoo Finance, falling back to the database cache"""
         try:
             # Rate limiting to avoid Yahoo Finance blocks
             self._rate_limit()
@@ -96,31 +150,9 @@ class DataService:
             # If real-time data failed, try to get cached data from database (only if recent)
             if (hist is None or hist.empty) and db is not None:
                 self.logger.info(f"Yahoo Finance failed for {symbol}, checking database cache")
-                cached_data = db.query(StockData).filter(StockData.symbol == symbol).order_by(StockData.timestamp.desc()).first()
-                
-                if cached_data and cached_data.close_price > 0:
-                    # Use cached data if it's less than 24 hours old (expanded due to API rate limiting)
-                    from datetime import datetime, timedelta
-                    cache_age_hours = (datetime.now() - cached_data.timestamp).total_seconds() / 3600
-                    
-                    if cache_age_hours <= 24:
-                        self.logger.info(f"Using cached data for {symbol} from {cached_data.timestamp} ({cache_age_hours:.1f} hours old)")
-                        return {
-                            "symbol": symbol,
-                            "current_price": float(cached_data.close_price),
-                            "price_change": 0,  # Could calculate from previous record
-                            "price_change_pct": 0,
-                            "market_cap": cached_data.market_cap,
-                            "pe_ratio": cached_data.pe_ratio,
-                            "dividend_yield": cached_data.dividend_yield,
-                            "historical_data": [],
-                            "company_name": symbol,
-                            "sector": "Unknown",
-                            "industry": "Unknown",
-                            "data_source": f"cached_{cache_age_hours:.1f}h_old"
-                        }
-                    else:
-                        self.logger.warning(f"Cached data for {symbol} is too old ({cache_age_hours:.1f} hours), will return error if no real-time data")
+                cached_data = self.get_cached_market_data(db, symbol)
+                if cached_data:
+                    return cached_data
             
             # If both real-time and cached data failed, return error - NO MOCK DATA
             if hist is None or hist.empty:
@@ -133,22 +165,17 @@ class DataService:
                 }
             
             # Get current stock info
-            try:
-                info = stock.info
-            except:
-                info = {}
+            info = self._get_company_info(stock, symbol)
             
             # Format historical data
-            historical_data = []
-            for index, row in hist.iterrows():
-                historical_data.append({
-                    "date": index.strftime("%Y-%m-%d"),
-                    "open": float(row['Open']),
-                    "high": float(row['High']),
-                    "low": float(row['Low']),
-                    "close": float(row['Close']),
-                    "volume": int(row['Volume'])
-                })
+            historical_data = pd.DataFrame({
+                "date": hist.index.strftime("%Y-%m-%d"),
+                "open": hist['Open'].to_numpy(dtype="float64"),
+                "high": hist['High'].to_numpy(dtype="float64"),
+                "low": hist['Low'].to_numpy(dtype="float64"),
+                "close": hist['Close'].to_numpy(dtype="float64"),
+                "volume": hist['Volume'].to_numpy(dtype="int64")
+            }).to_dict(orient="records")
             
             # Calculate basic metrics
             current_price = float(hist['Close'].iloc[-1])
@@ -186,72 +213,217 @@ class DataService:
                 "data_source": "error"
             }
     
-    def save_stock_data(self, db: Session, symbol: str) -> StockDataResponse:
-        """Save current stock data to database"""
+    def _get_company_info(self, stock: yf.Ticker, symbol: str) -> Dict:
+        """Company details from Ticker.info, reused from disk for COMPANY_INFO_CACHE_TTL seconds.
+        
+        These fields change at most daily but cost a separate Yahoo Finance
+        request, so they are cached in COMPANY_INFO_CACHE_FILE and survive
+        restarts. Returns {} if the lookup fails.
+        """
+        with _company_info_lock:
+            if _company_info_cache["entries"] is None:
+                _company_info_cache["entries"] = self._load_company_info_cache()
+            cached = _company_info_cache["entries"].get(symbol)
+        if cached is not None and time.time() - cached[0] < COMPANY_INFO_CACHE_TTL:
+            return cached[1]
+        
         try:
-            market_data = self.get_market_data(symbol, days=1)
-            
-            # Check if we have valid market data
-            if "error" in market_data:
-                self.logger.error(f"Cannot save stock data for {symbol}: {market_data['error']}")
-                raise Exception(f"Market data unavailable for {symbol}")
+            info = stock.info
+        except Exception:
+            return {}
+        
+        fields = {key: info.get(key) for key in COMPANY_INFO_FIELDS if info.get(key) is not None}
+        if not fields:
+            return fields  # Likely a throttled/empty response; ask again next time
+        with _company_info_lock:
+            _company_info_cache["entries"][symbol] = [time.time(), fields]
+            self._save_company_info_cache()
+        return fields
+    
+    def _load_company_info_cache(self) -> Dict[str, list]:
+        """Read the persisted company info cache; an unreadable file starts an empty cache"""
+        try:
+            with open(COMPANY_INFO_CACHE_FILE) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable company info cache {COMPANY_INFO_CACHE_FILE}: {str(e)}")
+            return {}
+    
+    def _save_company_info_cache(self) -> None:
+        """Merge the company info cache with the file on disk and write it back atomically.
+        
+        Other worker processes write the same file, so their entries are folded
+        in (newest fetch wins) rather than overwritten, and each write goes
+        through its own temporary file. The caller holds _company_info_lock.
+        """
+        entries = _company_info_cache["entries"]
+        for symbol, entry in self._load_company_info_cache().items():
+            if symbol not in entries or entries[symbol][0] < entry[0]:
+                entries[symbol] = entry
+        
+        tmp_path = None
+        try:
+            COMPANY_INFO_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", dir=COMPANY_INFO_CACHE_FILE.parent, suffix=".tmp", delete=False
+            ) as f:
+                tmp_path = f.name
+                json.dump(entries, f)
+            os.replace(tmp_path, COMPANY_INFO_CACHE_FILE)
+        except Exception as e:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            self.logger.warning(f"Could not write company info cache {COMPANY_INFO_CACHE_FILE}: {str(e)}")
+    
+    def get_cached_market_data(self, db: Session, symbol: str) -> Optional[Dict]:
+        """Market data from the latest stored StockData row, if it is under 24 hours old"""
+        cached_data = db.query(StockData).filter(StockData.symbol == symbol).order_by(StockData.timestamp.desc()).first()
+        return self._market_data_from_cached_row(symbol, cached_data)
+    
+    def _market_data_from_cached_row(self, symbol: str, cached_data: Optional[StockData]) -> Optional[Dict]:
+        """Market data built from a stored StockData row, if it is under 24 hours old"""
+        if cached_data and cached_data.close_price > 0:
+            # Use cached data if it's less than 24 hours old (expanded due to API rate limiting)
+            cache_age_hours = (datetime.now() - cached_data.timestamp).total_seconds() / 3600
             
-            # Use current price data if no historical data available
-            if not market_data.get("historical_data"):
-                hist_data = {
-                    "open": market_data["current_price"],
-                    "high": market_data["current_price"],
-                    "low": market_data["current_price"],
-                    "close": market_data["current_price"],
-                    "volume": 0  # No volume data available
+            if cache_age_hours <= 24:
+                self.logger.info(f"Using cached data for {symbol} from {cached_data.timestamp} ({cache_age_hours:.1f} hours old)")
+                return {
+                    "symbol": symbol,
+                    "current_price": float(cached_data.close_price),
+                    "price_change": 0,  # Could calculate from previous record
+                    "price_change_pct": 0,
+                    "market_cap": cached_data.market_cap,
+                    "pe_ratio": cached_data.pe_ratio,
+                    "dividend_yield": cached_data.dividend_yield,
+                    "historical_data": [],
+                    "company_name": symbol,
+                    "sector": "Unknown",
+                    "industry": "Unknown",
+                    "data_source": f"cached_{cache_age_hours:.1f}h_old"
                 }
             else:
-                hist_data = market_data["historical_data"][-1]
+                self.logger.warning(f"Cached data for {symbol} is too old ({cache_age_hours:.1f} hours), will return error if no real-time data")
+        
+        return None
+    
+    def save_stock_data(self, db: Session, symbol: str, market_data: Optional[Dict] = None) -> StockDataResponse:
+        """Save current stock data to database, fetching it unless already provided"""
+        try:
+            if market_data is None:
+                market_data = self.get_market_data(symbol, days=1)
+            
+            stock_data = self._build_stock_data(symbol, market_data)
+            
+            latest = self._get_recent_stock_rows(db, [symbol], limit=1).get(symbol, [None])[0]
+            if not self._has_valid_price(stock_data):
+                self.logger.info(f"Skipped invalid write for {symbol}; keeping stored data")
+                if latest is None:
+                    raise Exception(f"Invalid price for {symbol}")
+                return StockDataResponse.model_validate(latest)
             
-            stock_data = StockData(
-                symbol=symbol,
-                open_price=hist_data["open"],
-                high_price=hist_data["high"],
-                low_price=hist_data["low"],
-                close_price=hist_data["close"],
-                volume=hist_data["volume"],
-                market_cap=market_data.get("market_cap"),
-                pe_ratio=market_data.get("pe_ratio"),
-                dividend_yield=market_data.get("dividend_yield")
-            )
+            if self._is_same_bar(stock_data, latest):
+                # Nothing new to store, but the stored bar has just been confirmed current
+                latest.timestamp = func.now()
+                db.commit()
+                db.refresh(latest)
+                return StockDataResponse.model_validate(latest)
             
             db.add(stock_data)
             db.commit()
             db.refresh(stock_data)
             
-            return StockDataResponse.from_orm(stock_data)
+            return StockDataResponse.model_validate(stock_data)
             
         except Exception as e:
             self.logger.error(f"Error saving stock data for {symbol}: {str(e)}")
             db.rollback()
             raise StockDataError(f"Failed to save stock data for {symbol}: {str(e)}")
     
+    def _build_stock_data(self, symbol: str, market_data: Dict) -> StockData:
+        """Unsaved StockData row for the latest bar of fetched market data"""
+        # Check if we have valid market data
+        if "error" in market_data:
+            self.logger.error(f"Cannot save stock data for {symbol}: {market_data['error']}")
+            raise Exception(f"Market data unavailable for {symbol}")
+        
+        # Use current price data if no historical data available
+        if not market_data.get("historical_data"):
+            hist_data = {
+                "open": market_data["current_price"],
+                "high": market_data["current_price"],
+                "low": market_data["current_price"],
+                "close": market_data["current_price"],
+                "volume": 0  # No volume data available
+            }
+        else:
+            hist_data = market_data["historical_data"][-1]
+        
+        return StockData(
+            symbol=symbol,
+            open_price=hist_data["open"],
+            high_price=hist_data["high"],
+            low_price=hist_data["low"],
+            close_price=hist_data["close"],
+            volume=hist_data["volume"],
+            market_cap=market_data.get("market_cap"),
+            pe_ratio=market_data.get("pe_ratio"),
+            dividend_yield=market_data.get("dividend_yield")
+        )
+    
+    def _has_valid_price(self, stock_data: StockData) -> bool:
+        """Whether a new row has a usable (positive) close price"""
+        return bool(stock_data.close_price) and stock_data.close_price > 0
+    
+    def _is_same_bar(self, stock_data: StockData, latest: Optional[StockData]) -> bool:
+        """Whether a new row repeats the latest stored bar.
+        
+        Yahoo Finance keeps returning the last session's bar over weekends and
+        holidays; rather than storing it again, the stored row's timestamp is
+        advanced so the 24 hour cached-price fallback keeps treating it as fresh.
+        """
+        if latest is None:
+            return False
+        return (
+            latest.open_price == stock_data.open_price
+            and latest.high_price == stock_data.high_price
+            and latest.low_price == stock_data.low_price
+            and latest.close_price == stock_data.close_price
+            and latest.volume == stock_data.volume
+        )
+    
     def get_tracked_stocks(self, db: Session) -> List[Dict]:
         """Get list of tracked stocks with latest data from DB if available, else live/mock data. Tracked stocks are all unique symbols in stock_data."""
         # Get all unique symbols from the stock_data table
         symbols = [row[0] for row in db.query(StockData.symbol).distinct().all()]
+        
+        # Get real-time market data with historical charts for every symbol at once
+        live_data = self._fetch_market_data_concurrently(symbols, days=30)
+        
+        # Stored rows for the symbols whose live fetch failed, loaded in one query
+        stored_rows = self._get_recent_stock_rows(
+            db, [symbol for symbol in symbols if "error" in live_data[symbol]], limit=30
+        )
+        
         stocks_data = []
         for symbol in symbols:
             try:
-                # Get real-time market data with historical charts
-                market_data = self.get_market_data(symbol, days=30, db=db)
+                market_data = live_data[symbol]
+                historical_stocks = stored_rows.get(symbol, [])
+                if "error" in market_data and historical_stocks:
+                    # Fall back to a recent cached quote before building one from history
+                    market_data = self._market_data_from_cached_row(symbol, historical_stocks[0]) or market_data
                 
                 if "error" not in market_data:
                     stocks_data.append(market_data)
                 else:
                     # If market data failed, try to get basic cached data
-                    stock_db = db.query(StockData).filter(StockData.symbol == symbol).order_by(StockData.timestamp.desc()).first()
-                    if stock_db:
-                        # Get historical data for price chart (last 30 days)
-                        historical_stocks = db.query(StockData).filter(
-                            StockData.symbol == symbol
-                        ).order_by(StockData.timestamp.desc()).limit(30).all()
+                    if historical_stocks:
+                        stock_db = historical_stocks[0]
                         
+                        # Historical data for price chart (last 30 rows)
                         historical_data = [
                             {
                                 "date": stock.timestamp.strftime("%Y-%m-%d"),
@@ -299,6 +471,40 @@ class DataService:
                 
         return stocks_data
     
+    def _get_recent_stock_rows(self, db: Session, symbols: List[str], limit: int) -> Dict[str, List[StockData]]:
+        """Up to `limit` most recent StockData rows per symbol, newest first, keyed by symbol."""
+        if not symbols:
+            return {}
+        
+        ranked = db.query(
+            StockData,
+            func.row_number().over(
+                partition_by=StockData.symbol,
+                order_by=StockData.timestamp.desc()
+            ).label("rank")
+        ).filter(StockData.symbol.in_(set(symbols))).subquery()
+        recent = aliased(StockData, ranked)
+        
+        rows = db.query(recent).filter(ranked.c.rank <= limit).order_by(
+            ranked.c.symbol, ranked.c.rank
+        ).all()
+        return {symbol: list(group) for symbol, group in groupby(rows, key=lambda row: row.symbol)}
+    
+    def _fetch_market_data_concurrently(self, symbols: List[str], days: int) -> Dict[str, Dict]:
+        """Live market data for each symbol, fetched on worker threads.
+        
+        Each fetch is a blocking Yahoo Finance round-trip, so up to
+        YF_MAX_CONCURRENCY of them run at once; _rate_limit's token bucket lets
+        that many start together and then admits YF_REQUESTS_PER_SECOND. No
+        database session is passed to the workers since sessions are not
+        thread-safe.
+        """
+        if not symbols:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(config.YF_MAX_CONCURRENCY or 8, len(symbols))) as executor:
+            results = executor.map(lambda symbol: self.get_market_data(symbol, days=days), symbols)
+            return dict(zip(symbols, results))
+    
     def add_stock(self, db: Session, symbol: str) -> Dict:
         """Add a stock to tracking by getting real market data and saving to database"""
         try:
@@ -329,13 +535,32 @@ class DataService:
             raise Exception(f"Failed to add {symbol}: {str(e)}")
     
     def _rate_limit(self) -> None:
-        """Implement rate limiting for API calls."""
-        elapsed = time.time() - self.last_api_call
-        if elapsed < config.API_RATE_LIMIT:
-            sleep_time = config.API_RATE_LIMIT - elapsed
+        """Implement rate limiting for API calls.
+        
+        Takes a token from the shared Yahoo Finance bucket, sleeping until one
+        is available. Callers reserve tokens under the lock (the count may go
+        negative), so concurrent threads queue up in order.
+        """
+        rate = config.YF_REQUESTS_PER_SECOND
+        if rate <= 0:
+            return
+        capacity = max(1, config.YF_MAX_CONCURRENCY)
+        
+        with _yahoo_bucket_lock:
+            now = time.monotonic()
+            tokens = _yahoo_bucket["tokens"]
+            if tokens is None:
+                tokens = capacity
+            else:
+                tokens = min(capacity, tokens + (now - _yahoo_bucket["updated"]) * rate)
+            tokens -= 1
+            _yahoo_bucket["tokens"] = tokens
+            _yahoo_bucket["updated"] = now
+        
+        if tokens < 0:
+            sleep_time = -tokens / rate
             self.logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f} seconds")
             time.sleep(sleep_time)
-        self.last_api_call = time.time()
     
     def add_stock(self, db: Session, symbol: str) -> Dict:
         """Add a new stock to track with validation and error handling."""
@@ -408,18 +633,46 @@ class DataService:
             StockData.timestamp >= cutoff_date
         ).order_by(StockData.timestamp).all()
         
-        return [StockDataResponse.from_orm(data) for data in stock_data]
+        return StockDataResponseList.validate_python(stock_data)
     
     def run_daily_data_collection(self, db: Session):
         """Collect daily market data for all tracked stocks"""
-        results = []
+        rows = []
+        
+        # get_market_data is already rate limited, so fetch everything up front
+        # and only the database writes stay on this thread
+        market_data = self._fetch_market_data_concurrently(list(self.tracked_stocks), days=1)
         
-        for symbol in self.tracked_stocks:
+        for symbol, data in market_data.items():
             try:
-                result = self.save_stock_data(db, symbol)
-                results.append(result)
-                self._rate_limit()  # Rate limiting
+                rows.append(self._build_stock_data(symbol, data))
             except Exception as e:
                 self.logger.error(f"Error collecting data for {symbol}: {str(e)}")
         
-        return results 
\ No newline at end of file
+        # Insert bars that are new; repeats of the stored bar only refresh its timestamp
+        latest_rows = self._get_recent_stock_rows(db, [row.symbol for row in rows], limit=1)
+        new_rows = []
+        confirmed_rows = []
+        for row in rows:
+            latest = latest_rows.get(row.symbol, [None])[0]
+            if not self._has_valid_price(row):
+                self.logger.info(f"Skipped invalid stock data write for {row.symbol}")
+            elif self._is_same_bar(row, latest):
+                confirmed_rows.append(latest)
+            else:
+                new_rows.append(row)
+        
+        # Write the whole collection in one transaction rather than committing per symbol
+        try:
+            db.add_all(new_rows)
+            if confirmed_rows:
+                db.query(StockData).filter(
+                    StockData.id.in_([row.id for row in confirmed_rows])
+                ).update({StockData.timestamp: func.now()}, synchronize_session=False)
+            db.commit()
+        except Exception as e:
+            self.logger.error(f"Error saving collected stock data: {str(e)}")
+            db.rollback()
+            raise StockDataError(f"Failed to save collected stock data: {str(e)}")
+        
+        return StockDataResponseList.validate_python(new_rows + confirmed_rows)
@@ -12,7 +12,7 @@ from models import (
     Position, Strategy, PositionExitEvent, Trade, StockData,
     PositionStatus, ExitConditionType, StrategyType
 )
-from schemas import TradeCreate
+from schemas import TradeCreate, PositionSummaryItem
 # Avoid circular import - import TradingService when needed
 from services.data_service import DataService
 from exceptions import TradingAppException
@@ -276,19 +276,19 @@ class PositionManager:
             }
             
             for position in positions:
-                summary['positions'].append({
-                    'id': position.id,
-                    'symbol': position.symbol,
-                    'strategy': position.strategy.name,
-                    'entry_price': position.entry_price,
-                    'current_price': self._get_current_price(position.symbol),
-                    'quantity': position.quantity,
-                    'status': position.status,
-                    'unrealized_pnl': position.unrealized_pnl,
-                    'realized_pnl': position.realized_pnl,
-                    'entry_timestamp': position.entry_timestamp,
-                    'exit_timestamp': position.exit_timestamp
-                })
+                summary['positions'].append(PositionSummaryItem(
+                    id=position.id,
+                    symbol=position.symbol,
+                    strategy=position.strategy.name,
+                    entry_price=position.entry_price,
+                    current_price=self._get_current_price(position.symbol),
+                    quantity=position.quantity,
+                    status=position.status,
+                    unrealized_pnl=position.unrealized_pnl,
+                    realized_pnl=position.realized_pnl,
+                    entry_timestamp=position.entry_timestamp,
+                    exit_timestamp=position.exit_timestamp
+                ))
             
             return summary
             
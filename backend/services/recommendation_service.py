@@ -10,6 +10,7 @@ from sqlalchemy import desc, and_
 from models import TradeRecommendation, SentimentData, StockData
 from schemas import (
     TradeRecommendationResponse, 
+    TradeRecommendationResponseList,
     MarketScanResult, 
     StrategySignal,
     TradeCreate
@@ -113,7 +114,7 @@ class RecommendationService:
             db.refresh(recommendation)
             
             self.logger.info(f"Created {action} recommendation for {symbol}: {recommended_quantity} shares at ${current_price:.2f}")
-            return TradeRecommendationResponse.from_orm(recommendation)
+            return TradeRecommendationResponse.model_validate(recommendation)
             
         except Exception as e:
             self.logger.error(f"Error analyzing {symbol}: {str(e)}")
@@ -248,7 +249,7 @@ class RecommendationService:
                 )
             ).order_by(desc(TradeRecommendation.created_at)).all()
             
-            return [TradeRecommendationResponse.from_orm(rec) for rec in recommendations]
+            return TradeRecommendationResponseList.validate_python(recommendations)
             
         except Exception as e:
             self.logger.error(f"Error getting pending recommendations: {str(e)}")
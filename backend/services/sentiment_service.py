@@ -3,7 +3,7 @@ import yfinance as yf
 from textblob import TextBlob
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, select, bindparam
 import pandas as pd
 from datetime import datetime, timedelta
 import os
@@ -16,6 +16,17 @@ from schemas import SentimentResponse
 from config import config
 from exceptions import SentimentAnalysisError, APIRateLimitError
 from services.alternative_news_service import AlternativeNewsService
+# Sentiment rows for a set of symbols over a time window; built once so the
+# compiled statement is reused across calls
+RECENT_WINDOW_COLUMNS = ["symbol", "timestamp", "overall_sentiment", "news_count", "social_count"]
+_RECENT_WINDOW_STMT = select(
+    *(getattr(SentimentData, column) for column in RECENT_WINDOW_COLUMNS)
+).where(
+    SentimentData.symbol.in_(bindparam("symbols", expanding=True)),
+    SentimentData.timestamp >= bindparam("start"),
+    SentimentData.timestamp <= bindparam("end")
+)
+
 
 class SentimentService:
     def __init__(self):
@@ -238,7 +249,7 @@ class SentimentService:
             db.commit()
             db.refresh(sentiment_data)
             
-            return SentimentResponse.from_orm(sentiment_data)
+            return SentimentResponse.model_validate(sentiment_data)
             
         except APIRateLimitError:
             db.rollback()
@@ -258,9 +269,14 @@ class SentimentService:
         ).order_by(desc(SentimentData.timestamp)).first()
         
         if sentiment_data:
-            return SentimentResponse.from_orm(sentiment_data)
+            return SentimentResponse.model_validate(sentiment_data)
         return None
     
+    def recent_window(self, db: Session, symbols: List[str], start: datetime, end: datetime) -> pd.DataFrame:
+        """All sentiment rows for the given symbols between start and end, in one query"""
+        rows = db.execute(_RECENT_WINDOW_STMT, {"symbols": list(symbols), "start": start, "end": end}).all()
+        return pd.DataFrame(rows, columns=RECENT_WINDOW_COLUMNS)
+    
     def get_all_sentiment(self, db: Session) -> List[SentimentResponse]:
         """Get sentiment for all tracked stocks"""
         # Get latest sentiment for each stock
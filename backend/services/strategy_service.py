@@ -4,7 +4,7 @@ Handles strategy creation, execution, and performance tracking.
 """
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Sequence
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, func
 
@@ -12,7 +12,11 @@ from models import (
     Strategy, Position, StrategyPerformance, SentimentData,
     StrategyType, PositionStatus
 )
-from schemas import StrategyCreate, StrategyResponse, StrategyRunRequest
+from pydantic import ValidationError
+from schemas import (
+    StrategyCreate, StrategyResponse, StrategyResponseList, StrategyRunRequest,
+    StrategyParameters, TYPED_PARAMETER_KINDS
+)
 from services.position_manager import PositionManager
 from services.sentiment_service import SentimentService
 from services.data_service import DataService
@@ -31,27 +35,7 @@ class StrategyService:
     def create_strategy(self, db: Session, strategy_data: StrategyCreate) -> StrategyResponse:
         """Create a new trading strategy."""
         try:
-            # Validate strategy type
-            if strategy_data.strategy_type not in [e.value for e in StrategyType]:
-                raise TradingAppException(f"Invalid strategy type: {strategy_data.strategy_type}")
-            
-            # Validate allocation percentage
-            if not 0 < strategy_data.allocation_percentage <= 100:
-                raise TradingAppException("Allocation percentage must be between 0 and 100")
-            
-            # Set default parameters based on strategy type
-            default_params = self._get_default_parameters(strategy_data.strategy_type)
-            params = {**default_params, **strategy_data.parameters}
-            
-            strategy = Strategy(
-                name=strategy_data.name,
-                strategy_type=strategy_data.strategy_type,
-                description=strategy_data.description,
-                parameters=params,
-                allocation_percentage=strategy_data.allocation_percentage,
-                max_positions=strategy_data.max_positions,
-                risk_level=strategy_data.risk_level
-            )
+            strategy = Strategy(**self._build_strategy_mapping(strategy_data))
             
             db.add(strategy)
             db.commit()
@@ -61,13 +45,41 @@ class StrategyService:
             self._create_performance_record(db, strategy.id)
             
             self.logger.info(f"Created strategy: {strategy.name} ({strategy.strategy_type})")
-            return StrategyResponse.from_orm(strategy)
+            return StrategyResponse.model_validate(strategy)
             
         except Exception as e:
             db.rollback()
             self.logger.error(f"Error creating strategy: {str(e)}")
             raise
     
+    def create_strategies_bulk(self, db: Session, strategies_data: Sequence[StrategyCreate]) -> List[Dict]:
+        """Create several strategies in one transaction, skipping the ORM unit of work."""
+        try:
+            mappings = [self._build_strategy_mapping(s) for s in strategies_data]
+            db.bulk_insert_mappings(Strategy, mappings)
+            
+            # Fetch generated IDs to attach the initial performance records
+            names = [m["name"] for m in mappings]
+            rows = db.query(Strategy.id, Strategy.name).filter(Strategy.name.in_(names)).all()
+            ids_by_name = {name: strategy_id for strategy_id, name in rows}
+            
+            now = datetime.now()
+            db.bulk_insert_mappings(StrategyPerformance, [
+                {"strategy_id": ids_by_name[m["name"]], "date": now} for m in mappings
+            ])
+            db.commit()
+            
+            for m in mappings:
+                m["id"] = ids_by_name[m["name"]]
+            
+            self.logger.info(f"Bulk created {len(mappings)} strategies")
+            return mappings
+            
+        except Exception as e:
+            db.rollback()
+            self.logger.error(f"Error bulk creating strategies: {str(e)}")
+            raise
+    
     def get_strategies(self, db: Session, active_only: bool = True) -> List[StrategyResponse]:
         """Get all strategies."""
         try:
@@ -76,7 +88,7 @@ class StrategyService:
                 query = query.filter(Strategy.is_active == True)
             
             strategies = query.all()
-            return [StrategyResponse.from_orm(s) for s in strategies]
+            return StrategyResponseList.validate_python(strategies)
             
         except Exception as e:
             self.logger.error(f"Error getting strategies: {str(e)}")
@@ -86,7 +98,7 @@ class StrategyService:
         """Get a specific strategy."""
         try:
             strategy = db.query(Strategy).filter(Strategy.id == strategy_id).first()
-            return StrategyResponse.from_orm(strategy) if strategy else None
+            return StrategyResponse.model_validate(strategy) if strategy else None
             
         except Exception as e:
             self.logger.error(f"Error getting strategy {strategy_id}: {str(e)}")
@@ -116,7 +128,7 @@ class StrategyService:
             db.refresh(strategy)
             
             self.logger.info(f"Updated strategy: {strategy.name}")
-            return StrategyResponse.from_orm(strategy)
+            return StrategyResponse.model_validate(strategy)
             
         except Exception as e:
             db.rollback()
@@ -266,6 +278,38 @@ class StrategyService:
             self.logger.error(f"Error updating strategy performance: {str(e)}")
             db.rollback()
     
+    def _build_strategy_mapping(self, strategy_data: StrategyCreate) -> Dict:
+        """Validate a strategy definition and return its column values."""
+        # Validate strategy type
+        if strategy_data.strategy_type not in [e.value for e in StrategyType]:
+            raise TradingAppException(f"Invalid strategy type: {strategy_data.strategy_type}")
+        
+        # Validate allocation percentage
+        if not 0 < strategy_data.allocation_percentage <= 100:
+            raise TradingAppException("Allocation percentage must be between 0 and 100")
+        
+        # Set default parameters based on strategy type
+        default_params = self._get_default_parameters(strategy_data.strategy_type)
+        params = {**default_params, **strategy_data.parameters}
+        
+        # Validate parameters against the typed model for this strategy type
+        if strategy_data.strategy_type in TYPED_PARAMETER_KINDS:
+            try:
+                typed_params = StrategyParameters.validate_python({**params, "kind": strategy_data.strategy_type})
+            except ValidationError as e:
+                raise TradingAppException(f"Invalid parameters for {strategy_data.strategy_type} strategy: {str(e)}")
+            params = typed_params.model_dump(exclude={"kind"}, exclude_none=True)
+        
+        return {
+            "name": strategy_data.name,
+            "strategy_type": strategy_data.strategy_type,
+            "description": strategy_data.description,
+            "parameters": params,
+            "allocation_percentage": strategy_data.allocation_percentage,
+            "max_positions": strategy_data.max_positions,
+            "risk_level": strategy_data.risk_level
+        }
+    
     def _get_default_parameters(self, strategy_type: str) -> Dict:
         """Get default parameters for a strategy type."""
         defaults = {
@@ -315,6 +359,7 @@ class StrategyService:
             params = strategy.parameters
             sentiment_threshold = params.get('sentiment_threshold', 0.6)
             min_news_count = params.get('min_news_count', 3)
+            position_size_pct = params.get('position_size_percentage', 2.0)
             
             signals = []
             positions_opened = 0
@@ -337,7 +382,6 @@ class StrategyService:
                         # Check if we can open a position
                         if self._can_open_position(db, strategy, symbol):
                             # Calculate position size
-                            position_size_pct = params.get('position_size_percentage', 2.0)
                             available_capital = self.position_manager._get_available_capital(db, strategy.id)
                             position_value = available_capital * (position_size_pct / 100.0)
                             
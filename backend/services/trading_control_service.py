@@ -22,7 +22,8 @@ from schemas import (
     TradingControlSettings, CapitalAllocationSettings, ExitStrategySettings,
     TradeSignalPreview, TradeApprovalRequest, CapitalAllocationStatus,
     ExitSignalPreview, TradingNotification, RiskAssessmentResponse,
-    TradingModeEnum, StrategySignal
+    TradingModeEnum, StrategySignal, TradeRiskAssessment, CapitalImpact,
+    PortfolioMetrics, PositionConcentration, VolatilityAnalysis
 )
 from services.data_service import DataService
 from config import config
@@ -145,12 +146,12 @@ class TradingControlService:
             risk_assessment = self._assess_trade_risk(db, signal, quantity, estimated_total)
             
             # Capital impact
-            capital_impact = {
-                "available_before": capital_status.cash_available_for_new_trades,
-                "available_after": capital_status.cash_available_for_new_trades - (estimated_total if signal.action == "BUY" else -estimated_total),
-                "reserve_cash_maintained": capital_status.cash_reserve_required,
-                "position_size_percent": (estimated_total / capital_status.total_portfolio_value) * 100
-            }
+            capital_impact = CapitalImpact(
+                available_before=capital_status.cash_available_for_new_trades,
+                available_after=capital_status.cash_available_for_new_trades - (estimated_total if signal.action == "BUY" else -estimated_total),
+                reserve_cash_maintained=capital_status.cash_reserve_required,
+                position_size_percent=(estimated_total / capital_status.total_portfolio_value) * 100
+            )
             
             preview = TradeSignalPreview(
                 signal_id=signal_id,
@@ -315,12 +316,12 @@ class TradingControlService:
                 warnings=warnings,
                 recommendations=recommendations,
                 portfolio_metrics=portfolio_metrics,
-                position_concentration={
-                    "max_position_percent": capital_status.largest_position_percent,
-                    "positions_over_5_percent": len([v for v in capital_status.sector_allocations.values() if v > 5])
-                },
+                position_concentration=PositionConcentration(
+                    max_position_percent=capital_status.largest_position_percent,
+                    positions_over_5_percent=len([v for v in capital_status.sector_allocations.values() if v > 5])
+                ),
                 sector_concentration=capital_status.sector_allocations,
-                volatility_analysis={"portfolio_beta": 1.0}  # Simplified for now
+                volatility_analysis=VolatilityAnalysis(portfolio_beta=1.0)  # Simplified for now
             )
             
         except Exception as e:
@@ -402,7 +403,7 @@ class TradingControlService:
             return {sector: (value / total_value) * 100 for sector, value in sector_values.items()}
         return {}
     
-    def _assess_trade_risk(self, db: Session, signal: StrategySignal, quantity: int, estimated_total: float) -> Dict[str, Any]:
+    def _assess_trade_risk(self, db: Session, signal: StrategySignal, quantity: int, estimated_total: float) -> TradeRiskAssessment:
         """Assess risk for a specific trade."""
         capital_status = self.get_capital_allocation_status(db)
         
@@ -416,33 +417,33 @@ class TradingControlService:
         elif position_percent > max_allowed * 0.8:
             risk_level = "MEDIUM"
         
-        return {
-            "risk_level": risk_level,
-            "position_size_percent": position_percent,
-            "max_allowed_percent": max_allowed,
-            "violates_position_limit": position_percent > max_allowed,
-            "sentiment_strength": abs(signal.sentiment_score),
-            "confidence_level": "HIGH" if signal.confidence > 0.8 else "MEDIUM" if signal.confidence > 0.6 else "LOW"
-        }
+        return TradeRiskAssessment(
+            risk_level=risk_level,
+            position_size_percent=position_percent,
+            max_allowed_percent=max_allowed,
+            violates_position_limit=position_percent > max_allowed,
+            sentiment_strength=abs(signal.sentiment_score),
+            confidence_level="HIGH" if signal.confidence > 0.8 else "MEDIUM" if signal.confidence > 0.6 else "LOW"
+        )
     
-    def _calculate_portfolio_metrics(self, db: Session, open_trades: List[Trade]) -> Dict[str, float]:
+    def _calculate_portfolio_metrics(self, db: Session, open_trades: List[Trade]) -> PortfolioMetrics:
         """Calculate basic portfolio performance metrics."""
         # Simplified metrics - could be expanded
         closed_trades = db.query(Trade).filter(Trade.status == "CLOSED").all()
         
         if not closed_trades:
-            return {"total_return": 0.0, "win_rate": 0.0, "total_trades": 0}
+            return PortfolioMetrics(total_return=0.0, win_rate=0.0, total_trades=0)
         
         total_pnl = sum(trade.profit_loss for trade in closed_trades if trade.profit_loss)
         winning_trades = len([t for t in closed_trades if t.profit_loss and t.profit_loss > 0])
         win_rate = (winning_trades / len(closed_trades)) * 100
         
-        return {
-            "total_return": total_pnl,
-            "win_rate": win_rate,
-            "total_trades": len(closed_trades),
-            "average_trade": total_pnl / len(closed_trades) if closed_trades else 0
-        }
+        return PortfolioMetrics(
+            total_return=total_pnl,
+            win_rate=win_rate,
+            total_trades=len(closed_trades),
+            average_trade=total_pnl / len(closed_trades) if closed_trades else 0
+        )
     
     def _create_notification(self, type: str, title: str, message: str, symbol: str = None, 
                            priority: str = "MEDIUM", action_required: bool = False) -> None:
@@ -9,10 +9,11 @@ import time
 import logging
 
 from models import Trade, SentimentData, PerformanceMetrics
-from schemas import TradeCreate, TradeResponse, StrategySignal
+from schemas import TradeCreate, TradeResponse, TradeResponseList, StrategySignal
 from services.sentiment_service import SentimentService
 from services.data_service import DataService
 from config import config
+from performance_fixes import invalidate_trades_cache  # Cached /api/trades payload
 from exceptions import (
     InsufficientBalanceError,
     InsufficientSharesError,
@@ -180,10 +181,11 @@ class TradingService:
             
             db.add(db_trade)
             db.commit()
+            invalidate_trades_cache()
             db.refresh(db_trade)
             
             self.logger.info(f"Trade created successfully: ID {db_trade.id}")
-            return TradeResponse.from_orm(db_trade)
+            return TradeResponse.model_validate(db_trade)
             
         except (InvalidTradeError, InsufficientBalanceError, InsufficientSharesError) as e:
             db.rollback()
@@ -198,7 +200,7 @@ class TradingService:
         """Get all trades with backward compatibility for missing columns"""
         try:
             trades = db.query(Trade).order_by(desc(Trade.timestamp)).all()
-            return [TradeResponse.from_orm(trade) for trade in trades]
+            return TradeResponseList.validate_python(trades)
         except Exception as e:
             self.logger.warning(f"Error querying trades with new schema, falling back: {str(e)}")
             try:
@@ -241,7 +243,7 @@ class TradingService:
         """Get a specific trade"""
         trade = db.query(Trade).filter(Trade.id == trade_id).first()
         if trade:
-            return TradeResponse.from_orm(trade)
+            return TradeResponse.model_validate(trade)
         return None
     
     def delete_trade(self, db: Session, trade_id: int) -> Dict:
@@ -272,6 +274,7 @@ class TradingService:
             
             db.delete(trade)
             db.commit()
+            invalidate_trades_cache()
             
             self.logger.info(f"Trade {trade_id} deleted successfully")
             return {"message": "Trade deleted successfully"}
@@ -312,9 +315,10 @@ class TradingService:
         self.logger.info(f"Updated balance after close: ${self.current_balance:.2f}")
         
         db.commit()
+        invalidate_trades_cache()
         db.refresh(trade)
         
-        return TradeResponse.from_orm(trade)
+        return TradeResponse.model_validate(trade)
     
     def cancel_trade(self, db: Session, trade_id: int, reason: str = "Manual cancellation") -> TradeResponse:
         """Cancel an OPEN trade and return capital to available balance"""
@@ -345,9 +349,10 @@ class TradingService:
         self.logger.info(f"Cancellation reason: {reason}")
         
         db.commit()
+        invalidate_trades_cache()
         db.refresh(trade)
         
-        return TradeResponse.from_orm(trade)
+        return TradeResponse.model_validate(trade)
     
     def auto_close_stale_trades(self, db: Session, max_age_hours: int = 24) -> Dict:
         """Automatically close OPEN trades older than specified hours"""
@@ -606,8 +611,8 @@ class TradingService:
             return {
                 "signals_generated": len(signals),
                 "trades_executed": len(executed_trades),
-                "executed_trades": [TradeResponse.from_orm(trade) for trade in executed_trades],
-                "signals": [signal.dict() for signal in signals]
+                "executed_trades": TradeResponseList.validate_python(executed_trades),
+                "signals": [signal.model_dump() for signal in signals]
             }
             
         except Exception as e:
@@ -1,13 +1,17 @@
+import gzip
 import pytest
 from unittest.mock import patch, MagicMock
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, sessionmaker
 
 from services.trading_service import TradingService
 from services.sentiment_service import SentimentService
 from services.data_service import DataService
 from services.recommendation_service import RecommendationService
-from models import Trade, SentimentData, StockData, TradeRecommendation
+from services.adaptive_learning_service import AdaptiveLearningService
+from services.admin_service import AdminService
+from models import Trade, SentimentData, StockData, TradeRecommendation, TradePattern
+from models_admin import User, DataExports
 from exceptions import TradingAppException
 
 
@@ -274,6 +278,29 @@ class TestDataService:
         assert len(result) == 1
         assert result[0]['symbol'] == 'AAPL'
         assert result[0]['close'] == 150.0
+    
+    def test_run_daily_data_collection_skips_invalid_and_repeated_bars(self, data_service, test_db):
+        """Repeated bars refresh the stored row, invalid prices are dropped, new bars are inserted"""
+        test_db.query(StockData).delete()
+        stale_time = datetime.utcnow() - timedelta(days=3)
+        test_db.add(StockData(symbol='AAPL', timestamp=stale_time, open_price=150.0, high_price=150.0,
+                              low_price=150.0, close_price=150.0, volume=0))
+        test_db.commit()
+        
+        data_service.tracked_stocks = ['AAPL', 'MSFT', 'BAD']
+        fetched = {
+            'AAPL': {'symbol': 'AAPL', 'current_price': 150.0, 'historical_data': []},
+            'MSFT': {'symbol': 'MSFT', 'current_price': 400.0, 'historical_data': []},
+            'BAD': {'symbol': 'BAD', 'current_price': 0.0, 'historical_data': []}
+        }
+        with patch.object(data_service, '_fetch_market_data_concurrently', return_value=fetched):
+            results = data_service.run_daily_data_collection(test_db)
+        
+        assert sorted(r.symbol for r in results) == ['AAPL', 'MSFT']
+        rows = test_db.query(StockData).order_by(StockData.symbol).all()
+        assert [row.symbol for row in rows] == ['AAPL', 'MSFT']
+        test_db.refresh(rows[0])
+        assert rows[0].timestamp > stale_time + timedelta(days=1)
 
 
 class TestRecommendationService:
@@ -368,4 +395,112 @@ class TestRecommendationService:
             result = recommendation_service.reject_recommendation(mock_session, 1, "Not suitable")
             
             assert mock_recommendation.status == 'REJECTED'
-            assert mock_session.commit.called
\ No newline at end of file
+            assert mock_session.commit.called
+
+
+class TestAdaptiveLearningService:
+    """Test AdaptiveLearningService pattern learning"""
+    
+    @pytest.fixture
+    def learning_service(self):
+        return AdaptiveLearningService()
+    
+    def _pattern_row(self, sentiment_score, profit_loss):
+        return {
+            "symbol": "AAPL",
+            "pattern_type": "SUCCESSFUL_ENTRY" if profit_loss > 0 else "FAILED_ENTRY",
+            "sentiment_score": sentiment_score,
+            "price_trend": "UP",
+            "volatility_level": "LOW",
+            "profit_loss": profit_loss,
+            "profit_loss_percent": profit_loss / 10
+        }
+    
+    @pytest.mark.parametrize("sentiment_score", [0.35, 0.45, -0.15, 0.05])
+    def test_upsert_patterns_updates_existing_bucket(self, learning_service, test_db, sentiment_score):
+        """Trades at a rounding boundary update their stored pattern instead of duplicating it"""
+        test_db.query(TradePattern).delete()
+        test_db.commit()
+        
+        first = learning_service._upsert_patterns(test_db, [self._pattern_row(sentiment_score, 10.0)])
+        second = learning_service._upsert_patterns(test_db, [
+            self._pattern_row(sentiment_score, 20.0),
+            self._pattern_row(sentiment_score, 30.0)
+        ])
+        
+        assert [r["action"] for r in first] == ["created"]
+        assert [r["action"] for r in second] == ["updated"]
+        
+        patterns = test_db.query(TradePattern).all()
+        assert len(patterns) == 1
+        test_db.refresh(patterns[0])
+        assert patterns[0].occurrence_count == 3
+        assert patterns[0].success_rate == pytest.approx(1.0)
+        assert patterns[0].profit_loss == pytest.approx(20.0)
+
+
+class TestAdminService:
+    """Test AdminService user listing and data exports"""
+    
+    @pytest.fixture
+    def admin_service(self):
+        return AdminService()
+    
+    def test_get_users_keyset_pagination(self, admin_service, test_db):
+        """Keyset pages cover every user once, in offset order, including created_at ties"""
+        test_db.query(User).delete()
+        base = datetime(2024, 1, 1)
+        for i, created_at in enumerate([base, base, base + timedelta(days=1), base + timedelta(days=2), base]):
+            test_db.add(User(google_id=f"g{i}", email=f"user{i}@example.com", name=f"User {i}",
+                             created_at=created_at))
+        test_db.commit()
+        
+        expected = [user["id"] for user in admin_service.get_users(test_db, limit=10)]
+        
+        paged = []
+        page = admin_service.get_users(test_db, limit=2)
+        while page:
+            paged.extend(user["id"] for user in page)
+            last = page[-1]
+            page = admin_service.get_users(test_db, limit=2, after_created_at=last["created_at"],
+                                           after_id=last["id"])
+        
+        assert len(expected) == 5
+        assert paged == expected
+    
+    def test_process_data_export_writes_gzipped_csv(self, admin_service, test_db, test_engine, tmp_path):
+        """The export worker streams the requested rows to a gzipped CSV and records the result"""
+        test_db.query(Trade).delete()
+        for symbol in ("AAPL", "MSFT", "NVDA"):
+            test_db.add(Trade(symbol=symbol, trade_type="BUY", quantity=1, price=10.0,
+                              total_value=10.0, status="OPEN"))
+        test_db.commit()
+        
+        export_id = admin_service.create_data_export(test_db, "trades", {}, "admin@example.com")["export_id"]
+        
+        with patch('services.admin_service.SessionLocal', sessionmaker(bind=test_engine)), \
+             patch('services.admin_service.EXPORT_DIR', tmp_path):
+            admin_service.process_data_export(export_id)
+        
+        export = test_db.query(DataExports).filter(DataExports.id == export_id).first()
+        test_db.refresh(export)
+        assert export.status == "completed"
+        assert export.record_count == 3
+        
+        with gzip.open(export.file_path, "rt") as f:
+            lines = f.read().splitlines()
+        assert lines[0].startswith("id,symbol,trade_type")
+        assert len(lines) == 4
+    
+    def test_process_data_export_marks_unknown_type_failed(self, admin_service, test_db, test_engine, tmp_path):
+        """An export the worker can't produce is marked failed with the error"""
+        export_id = admin_service.create_data_export(test_db, "unknown", {}, "admin@example.com")["export_id"]
+        
+        with patch('services.admin_service.SessionLocal', sessionmaker(bind=test_engine)), \
+             patch('services.admin_service.EXPORT_DIR', tmp_path):
+            admin_service.process_data_export(export_id)
+        
+        export = test_db.query(DataExports).filter(DataExports.id == export_id).first()
+        test_db.refresh(export)
+        assert export.status == "failed"
+        assert export.error_message